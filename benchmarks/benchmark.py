@@ -0,0 +1,210 @@
+"""
+Benchmarks every function of sort_algorithms/sort.py and search_algorithms/search.py over several input
+sizes and shapes, and reports the time, the number of comparisons per element (per query for searches)
+and the peak memory allocated by each run.
+
+Usage:
+    python benchmarks/benchmark.py
+    python benchmarks/benchmark.py --sizes 1000 100000 --shapes random sorted --format json > results.json
+
+Comparisons are counted by wrapping every element in an object whose comparison operators increment a
+counter, so they are only reported for comparison-based functions running in this process. Peak memory
+is measured with tracemalloc and does not include worker processes.
+"""
+import argparse
+import inspect
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from search_algorithms import search  # noqa: E402
+from sort_algorithms import sort  # noqa: E402
+
+SHAPES = ["random", "sorted", "reversed", "duplicates", "nearly_sorted"]
+QUADRATIC = {"selection_sort", "bubble_sort", "insertion_sort"}
+NOT_COUNTED = {"radix_sort", "counting_sort", "auto_sort", "parallel_sort", "external_sort", "interpolation_search"}
+# functions that are not called as f(arr) (sorts) or f(arr, target) (searches)
+SORT_ADAPTERS = {
+    "external_sort": lambda f, arr: f([str(item) for item in arr], io.StringIO()),
+}
+SEARCH_ADAPTERS = {
+    "binary_search_many": lambda f, arr, targets: f(arr, targets),
+    "count_in_range": lambda f, arr, targets: [f(arr, t, t) for t in targets],
+    "iter_range": lambda f, arr, targets: [sum(1 for _ in f(arr, t, t)) for t in targets],
+    "choose_strategy": lambda f, arr, targets: f(arr),
+}
+
+
+class Counted:
+    # wraps a value and counts every comparison made against it
+    __slots__ = ("value",)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        Counted.comparisons += 1
+        return self.value < other.value
+
+    def __gt__(self, other):
+        Counted.comparisons += 1
+        return self.value > other.value
+
+    def __le__(self, other):
+        Counted.comparisons += 1
+        return self.value <= other.value
+
+    def __ge__(self, other):
+        Counted.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        Counted.comparisons += 1
+        return self.value == other.value
+
+    __hash__ = None
+
+
+def make_data(shape, size, rng):
+    """
+    Returns a list of size ints with the given shape.
+    """
+    if shape == "duplicates":
+        return [rng.randrange(10) for _ in range(size)]
+    data = [rng.randrange(size * 10) for _ in range(size)]
+    if shape == "sorted":
+        data.sort()
+    elif shape == "reversed":
+        data.sort(reverse=True)
+    elif shape == "nearly_sorted":
+        data.sort()
+        for _ in range(max(1, size // 100)):
+            i, j = rng.randrange(size), rng.randrange(size)
+            data[i], data[j] = data[j], data[i]
+    return data
+
+
+def public_functions(module):
+    """
+    Returns the public functions defined in a module, in source order.
+    """
+    functions = [f for name, f in inspect.getmembers(module, inspect.isfunction)
+                 if not name.startswith("_") and f.__module__ == module.__name__]
+    return sorted(functions, key=lambda f: f.__code__.co_firstlineno)
+
+
+def measure(call, repeat):
+    """
+    Runs call() repeat times and returns the best wall time and the peak traced memory of one extra run.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def count_comparisons(call):
+    Counted.comparisons = 0
+    call()
+    return Counted.comparisons
+
+
+def bench_sorts(sizes, shapes, repeat, max_quadratic, seed):
+    rows = []
+    for f in public_functions(sort):
+        adapter = SORT_ADAPTERS.get(f.__name__, lambda f, arr: f(arr))
+        for shape in shapes:
+            for size in sizes:
+                row = {"module": "sort", "function": f.__name__, "shape": shape, "size": size}
+                rows.append(row)
+                if f.__name__ in QUADRATIC and size > max_quadratic:
+                    row["skipped"] = "quadratic"
+                    continue
+                data = make_data(shape, size, random.Random(seed))
+                row["seconds"], row["peak_bytes"] = measure(lambda: adapter(f, data[:]), repeat)
+                if f.__name__ not in NOT_COUNTED:
+                    wrapped = [Counted(item) for item in data]
+                    row["comparisons_per_element"] = count_comparisons(lambda: adapter(f, wrapped[:])) / max(size, 1)
+    return rows
+
+
+def bench_searches(sizes, shapes, repeat, queries, seed):
+    rows = []
+    for f in public_functions(search):
+        adapter = SEARCH_ADAPTERS.get(f.__name__, lambda f, arr, targets: [f(arr, t) for t in targets])
+        for shape in shapes:
+            for size in sizes:
+                rng = random.Random(seed)
+                data = sorted(make_data(shape, size, rng))
+                # mostly hits, plus some values that are not in the data
+                targets = [rng.choice(data) if rng.random() < 0.8 else rng.randrange(-size, size * 11)
+                           for _ in range(queries)]
+                row = {"module": "search", "function": f.__name__, "shape": shape, "size": size}
+                row["seconds"], row["peak_bytes"] = measure(lambda: adapter(f, data, targets), repeat)
+                if f.__name__ not in NOT_COUNTED:
+                    wrapped = [Counted(item) for item in data]
+                    wrapped_targets = [Counted(t) for t in targets]
+                    row["comparisons_per_query"] = count_comparisons(
+                        lambda: adapter(f, wrapped, wrapped_targets)) / max(queries, 1)
+                rows.append(row)
+    return rows
+
+
+def print_table(rows):
+    columns = ["module", "function", "shape", "size", "seconds", "comparisons", "peak_bytes"]
+    lines = [columns]
+    for row in rows:
+        comparisons = row.get("comparisons_per_element", row.get("comparisons_per_query"))
+        if "skipped" in row:
+            seconds = "skipped"
+        else:
+            seconds = "%.6f" % row["seconds"]
+        lines.append([row["module"], row["function"], row["shape"], str(row["size"]), seconds,
+                      "-" if comparisons is None else "%.2f" % comparisons,
+                      str(row.get("peak_bytes", "-"))])
+    widths = [max(len(line[i]) for line in lines) for i in range(len(columns))]
+    for line in lines:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=SHAPES)
+    parser.add_argument("--only", choices=["sort", "search"], help="benchmark only one module")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best one is kept")
+    parser.add_argument("--queries", type=int, default=1000, help="search targets per case")
+    parser.add_argument("--max-quadratic", type=int, default=5000,
+                        help="largest size given to the O(n^2) sorts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["table", "json"], default="table")
+    args = parser.parse_args(argv)
+
+    rows = []
+    if args.only in (None, "sort"):
+        rows += bench_sorts(args.sizes, args.shapes, args.repeat, args.max_quadratic, args.seed)
+    if args.only in (None, "search"):
+        rows += bench_searches(args.sizes, args.shapes, args.repeat, args.queries, args.seed)
+    if args.format == "json":
+        json.dump({"python": sys.version.split()[0], "results": rows}, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Measures the throughput of the blocking queues of data_structures/queues.py against the standard library:
+ConcurrentQueue against queue.Queue with producer and consumer threads, and AsyncQueue against asyncio.Queue
+with producer and consumer tasks. The batched rows drain the queue with get_batch instead of one get per item.
+
+Usage:
+    python benchmarks/queue_benchmark.py
+    python benchmarks/queue_benchmark.py --items 200000 --producers 4 --consumers 4 --limit 1024 --format json
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_structures.queues import AsyncQueue, ConcurrentQueue  # noqa: E402
+
+STOP = object()
+
+
+def run_threads(name, q, put, get, items, producers, consumers):
+    """
+    Pushes items through q with producer and consumer threads and returns a result row.
+    get is a function returning a list of items, so batched and single gets share the consumer loop.
+    """
+    per_producer = items // producers
+
+    def produce():
+        for i in range(per_producer):
+            put(i)
+
+    def consume():
+        while True:
+            stops = sum(1 for item in get() if item is STOP)
+            if stops:
+                # a batch can hold the stop markers of other consumers: hand them back
+                for _ in range(stops - 1):
+                    put(STOP)
+                return
+
+    threads = [threading.Thread(target=consume) for _ in range(consumers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    workers = [threading.Thread(target=produce) for _ in range(producers)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    for _ in range(consumers):
+        put(STOP)
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    return {"queue": name, "items": per_producer * producers, "seconds": seconds,
+            "items_per_second": per_producer * producers / seconds}
+
+
+def run_tasks(name, make_queue, put, get, items, producers, consumers):
+    """
+    Same as run_threads with asyncio tasks; make_queue is called inside the event loop.
+    """
+    per_producer = items // producers
+
+    async def main():
+        q = make_queue()
+
+        async def produce():
+            for i in range(per_producer):
+                await put(q, i)
+
+        async def consume():
+            while True:
+                stops = sum(1 for item in await get(q) if item is STOP)
+                if stops:
+                    for _ in range(stops - 1):
+                        await put(q, STOP)
+                    return
+
+        tasks = [asyncio.ensure_future(consume()) for _ in range(consumers)]
+        start = time.perf_counter()
+        await asyncio.gather(*[produce() for _ in range(producers)])
+        for _ in range(consumers):
+            await put(q, STOP)
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+    seconds = asyncio.run(main())
+    return {"queue": name, "items": per_producer * producers, "seconds": seconds,
+            "items_per_second": per_producer * producers / seconds}
+
+
+async def _get_one(q):
+    return [await q.get()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--producers", type=int, default=2)
+    parser.add_argument("--consumers", type=int, default=2)
+    parser.add_argument("--limit", type=int, default=256, help="queue capacity")
+    parser.add_argument("--batch", type=int, default=64, help="items per get_batch call")
+    parser.add_argument("--format", choices=["table", "json"], default="table")
+    args = parser.parse_args(argv)
+    run = (args.items, args.producers, args.consumers)
+
+    rows = []
+    stdlib = queue.Queue(args.limit)
+    rows.append(run_threads("queue.Queue", stdlib, stdlib.put, lambda: [stdlib.get()], *run))
+    ours = ConcurrentQueue(args.limit)
+    rows.append(run_threads("ConcurrentQueue", ours, ours.put, lambda: [ours.get()], *run))
+    ours = ConcurrentQueue(args.limit)
+    rows.append(run_threads("ConcurrentQueue.get_batch", ours, ours.put,
+                            lambda: ours.get_batch(args.batch), *run))
+    rows.append(run_tasks("asyncio.Queue", lambda: asyncio.Queue(args.limit),
+                          lambda q, item: q.put(item), _get_one, *run))
+    rows.append(run_tasks("AsyncQueue", lambda: AsyncQueue(args.limit),
+                          lambda q, item: q.put(item), _get_one, *run))
+    rows.append(run_tasks("AsyncQueue.get_batch", lambda: AsyncQueue(args.limit),
+                          lambda q, item: q.put(item), lambda q: q.get_batch(args.batch), *run))
+
+    if args.format == "json":
+        json.dump({"python": sys.version.split()[0], "results": rows}, sys.stdout, indent=2)
+        print()
+    else:
+        width = max(len(row["queue"]) for row in rows)
+        print("queue".ljust(width), "seconds".rjust(10), "items/s".rjust(12))
+        for row in rows:
+            print(row["queue"].ljust(width), ("%.4f" % row["seconds"]).rjust(10),
+                  ("%.0f" % row["items_per_second"]).rjust(12))
+
+
+if __name__ == "__main__":
+    main()
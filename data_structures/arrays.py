@@ -1,34 +1,104 @@
 # implementation of array
+import sys
+from array import array
+
+# typecode used for each element type when none is given
+TYPECODES = {int: "q", float: "d"}
+# NumPy kind of each array.array typecode: signed int, unsigned int or float
+_KINDS = {"b": "i", "h": "i", "i": "i", "l": "i", "q": "i",
+          "B": "u", "H": "u", "I": "u", "L": "u", "Q": "u", "f": "f", "d": "f"}
+
+
 class Array:
-    def __init__(self, sizeOfArray, arrayType=int):
-        self.sizeOfArray = len(list(map(arrayType, range(sizeOfArray))))
-        self.arrayItems = [arrayType(0)] * sizeOfArray
+    # a dynamic array of machine values stored contiguously in an array.array buffer,
+    # instead of a list of pointers to boxed Python objects
+    def __init__(self, sizeOfArray=0, arrayType=int, typecode=None):
+        if typecode is None:
+            if arrayType not in TYPECODES:
+                raise TypeError("Array only stores numeric types, got " + str(arrayType))
+            typecode = TYPECODES[arrayType]
+        self.typecode = typecode
+        self.arrayItems = array(typecode, bytes(array(typecode).itemsize * sizeOfArray))
         self.arrayType = arrayType
 
+    @property
+    def sizeOfArray(self):
+        return len(self.arrayItems)
+
+    def __len__(self):
+        return len(self.arrayItems)
+
     def __str__(self):
         return " ".join([str(i) for i in self.arrayItems])
 
+    def __getitem__(self, index):
+        return self.arrayItems[index]
+
+    def __setitem__(self, index, value):
+        self.arrayItems[index] = value
+
+    def __iter__(self):
+        return iter(self.arrayItems)
+
+    def __buffer__(self, flags):
+        # buffer protocol (Python 3.12+): numpy.asarray(a) and memoryview(a) share the memory without copying
+        return memoryview(self.arrayItems)
+
+    @property
+    def __array_interface__(self):
+        # NumPy array interface, for Pythons without __buffer__: numpy.asarray(a) wraps the items without copying.
+        # The data is a memoryview, so the array cannot grow or shrink while a NumPy view of it is alive
+        if self.typecode not in _KINDS:
+            raise AttributeError("no array interface for typecode " + repr(self.typecode))
+        byteorder = "<" if sys.byteorder == "little" else ">"
+        return {
+            "version": 3,
+            "shape": (len(self.arrayItems),),
+            "typestr": byteorder + _KINDS[self.typecode] + str(self.arrayItems.itemsize),
+            "data": memoryview(self.arrayItems),
+        }
+
     def search(self, keyToSearch):
         for i in range(self.sizeOfArray):
             if self.arrayItems[i] == keyToSearch:
                 return i
         return -1
 
+    def append(self, keyToAppend):
+        # array.array over-allocates when it grows, so appends are amortized O(1)
+        self.arrayItems.append(keyToAppend)
+
+    def extend(self, keysToAppend):
+        # one bulk copy for arrays and buffers of the same type, otherwise one pass over the iterable
+        if isinstance(keysToAppend, Array):
+            keysToAppend = keysToAppend.arrayItems
+        if isinstance(keysToAppend, array) and keysToAppend.typecode == self.typecode:
+            self.arrayItems.extend(keysToAppend)
+        else:
+            self.arrayItems.fromlist(list(keysToAppend))
+
     def insert(self, keyToInsert, position):
-        if self.sizeOfArray > position:
-            for i in range(self.sizeOfArray - 2, position - 1, -1):
-                self.arrayItems[i + 1] = self.arrayItems[i]
-            self.arrayItems[position] = keyToInsert
+        # array.insert shifts the tail right with a single memmove
+        if self.sizeOfArray >= position:
+            self.arrayItems.insert(position, keyToInsert)
         else:
             print("Array size is:", self.sizeOfArray)
 
     def delete(self, keyToDelete, position):
+        # the slice deletion shifts the tail left with a single memmove
         if self.sizeOfArray > position:
-            for i in range(position, self.sizeOfArray - 1):
-                self.arrayItems[i] = self.arrayItems[i + 1]
+            del self.arrayItems[position]
         else:
             print("Array size is:", self.sizeOfArray)
 
+    def view(self, start=0, stop=None):
+        # a memoryview of the items in [start, stop) that shares memory with the array;
+        # the array cannot grow or shrink while a view is alive
+        return memoryview(self.arrayItems)[start:stop]
+
+    def getMemorySize(self):
+        return self.arrayItems.itemsize * len(self.arrayItems)
+
 
 if __name__ == "__main__":
     # test array
@@ -39,3 +109,8 @@ if __name__ == "__main__":
     print(a)
     a.delete(2, 5)
     print(a)
+    a.append(7)
+    a.extend(range(3))
+    print(a)
+    print(a.view(2, 5).tolist())
+    print(a.getMemorySize())
@@ -0,0 +1,540 @@
+"""
+Quick summary:
+    a balanced search tree whose nodes are fixed-size disk pages holding many keys each.
+Also known as:
+    B+ tree, B-tree index.
+Important facts:
+    - Every node fits in one page, so a lookup reads one page per level, and with hundreds of keys per page
+      the tree stays only a few levels deep even for billions of keys.
+    - In a B+ tree, internal nodes only hold separator keys and page numbers of their children; all the values
+      live in the leaves.
+    - The leaves are linked from left to right, so a range scan finds its first key and then follows the links.
+    - Full nodes are split in two and the separator moves up; the tree only grows in height when the root splits,
+      so all the leaves are always at the same depth.
+    - Sorted input can be bulk loaded bottom-up: fill leaves one after another, then build each level above from
+      the first keys of the level below. That writes every page exactly once.
+Pros:
+    - Few page reads per operation, and pages map directly onto the blocks of the file system.
+    - Sorted order: range scans and min/max are cheap.
+Cons:
+    - Much more involved than in-memory trees.
+    - Pages are only partly full after random insertions, which wastes some space.
+Notable uses:
+    - Database and file system indexes.
+Time complexity (worst case):
+    - Search: O(log(n))
+    - Insertion: O(log(n))
+    - Deletion: O(log(n))
+    - Range scan: O(log(n) + k) for k results
+
+This implementation stores int64 keys and int64 values in 4 KiB pages of a memory-mapped file:
+
+    page 0: header (magic, page size, root page, page count, key count, first leaf, height)
+    page n: node header (kind, key count, next leaf) + keys + values (leaves) or child page numbers (internal nodes)
+
+Decoded pages are kept in an LRU page cache. Changes are made crash-safe with a rollback journal, as in SQLite:
+before a page of the file is overwritten for the first time in a transaction, its original content is appended
+to "<path>-journal" and the journal is flushed to disk. commit() writes the changed pages and deletes the journal,
+which is the moment the transaction becomes durable. Opening a file that still has a journal (the process died
+before committing) copies the original pages back, so the file returns to its last committed state.
+"""
+
+import mmap
+import operator
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+PAGE_SIZE = 4096
+
+_HEADER = struct.Struct("<8sqqqqqq")
+_MAGIC = b"BPTREE01"
+_NODE_HEADER = struct.Struct("<B3xIq") # kind, key count, next leaf page
+_LEAF = 1
+_INTERNAL = 2
+_NO_PAGE = -1
+
+# keys and values (or child page numbers) are stored in two int64 arrays after the node header
+LEAF_CAPACITY = (PAGE_SIZE - _NODE_HEADER.size) // 16
+INTERNAL_CAPACITY = (PAGE_SIZE - _NODE_HEADER.size - 8) // 16
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+_JOURNAL_HEADER = struct.Struct("<8sqq") # magic, page size, size of the file when the transaction began
+_JOURNAL_MAGIC = b"BPTJRNL1"
+_JOURNAL_PAGE = struct.Struct("<q")
+
+
+class _Page:
+    # decoded node: values holds the values of a leaf or the child page numbers of an internal node
+    __slots__ = ("number", "leaf", "keys", "values", "next", "dirty")
+
+    def __init__(self, number, leaf, keys, values, next=_NO_PAGE):
+        self.number = number
+        self.leaf = leaf
+        self.keys = keys
+        self.values = values
+        self.next = next
+        self.dirty = False
+
+
+def _int64(number, what):
+    # the pages only hold int64 keys and values: anything else is rejected before the tree is changed,
+    # instead of failing in the middle of writing pages at commit time
+    try:
+        number = operator.index(number)
+    except TypeError:
+        raise TypeError(what + " must be an integer, got " + type(number).__name__) from None
+    if not INT64_MIN <= number <= INT64_MAX:
+        raise OverflowError(what + " does not fit in int64: " + str(number))
+    return number
+
+
+def _fsyncDirectory(path):
+    # makes the creation or deletion of a file in the directory durable; not possible on every platform
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BPlusTree:
+    """
+    Disk-backed B+ tree mapping int64 keys to int64 values. Opening an existing file only reads its header,
+    pages are decoded on first use. Changes are grouped in a transaction that ends with commit() (or rollback());
+    using the tree as a context manager commits on success and rolls back on error.
+    """
+    def __init__(self, path, cachePages=256):
+        self.path = path
+        self.journalPath = path + "-journal"
+        self.cachePages = max(cachePages, 16)
+        self.cache = OrderedDict()
+        self.journal = None
+        self.journaled = set()
+        self.journalPages = 0 # pages that existed when the transaction began, only those need journaling
+        self.journalSynced = True
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self._create()
+        elif os.path.exists(self.journalPath):
+            self._recover()
+        self._map()
+        self._readHeader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, exc, traceback):
+        if excType is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.get(key, _NO_VALUE) is not _NO_VALUE
+
+    def __iter__(self):
+        for key, value in self.iterRange():
+            yield key
+
+    # ---------------------------------------------------------------- file and pages
+
+    def _create(self):
+        # an empty tree: the header and one empty leaf as the root
+        self.file.truncate(2 * PAGE_SIZE)
+        self.file.seek(0)
+        self.file.write(_HEADER.pack(_MAGIC, PAGE_SIZE, 1, 2, 0, 1, 1))
+        self.file.seek(PAGE_SIZE)
+        self.file.write(_NODE_HEADER.pack(_LEAF, 0, _NO_PAGE))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        _fsyncDirectory(self.path)
+
+    def _map(self):
+        self.fileSize = os.fstat(self.file.fileno()).st_size
+        self.mm = mmap.mmap(self.file.fileno(), self.fileSize)
+
+    def _readHeader(self):
+        magic, pageSize, self.root, self.pageCount, self.count, self.firstLeaf, self.height = \
+            _HEADER.unpack_from(self.mm, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a B+ tree file: " + str(self.path))
+        if pageSize != PAGE_SIZE:
+            raise ValueError("Unsupported page size " + str(pageSize) + " in " + str(self.path))
+
+    def _writeHeader(self):
+        _HEADER.pack_into(self.mm, 0, _MAGIC, PAGE_SIZE, self.root, self.pageCount, self.count,
+                          self.firstLeaf, self.height)
+
+    def _decode(self, number):
+        offset = number * PAGE_SIZE
+        kind, count, next = _NODE_HEADER.unpack_from(self.mm, offset)
+        offset += _NODE_HEADER.size
+        capacity = LEAF_CAPACITY if kind == _LEAF else INTERNAL_CAPACITY
+        keys = list(struct.unpack_from("<%dq" % count, self.mm, offset))
+        values = list(struct.unpack_from("<%dq" % (count if kind == _LEAF else count + 1),
+                                         self.mm, offset + 8 * capacity))
+        return _Page(number, kind == _LEAF, keys, values, next)
+
+    def _encode(self, page):
+        offset = page.number * PAGE_SIZE
+        _NODE_HEADER.pack_into(self.mm, offset, _LEAF if page.leaf else _INTERNAL, len(page.keys), page.next)
+        offset += _NODE_HEADER.size
+        capacity = LEAF_CAPACITY if page.leaf else INTERNAL_CAPACITY
+        struct.pack_into("<%dq" % len(page.keys), self.mm, offset, *page.keys)
+        struct.pack_into("<%dq" % len(page.values), self.mm, offset + 8 * capacity, *page.values)
+
+    def _page(self, number):
+        page = self.cache.get(number)
+        if page is not None:
+            self.cache.move_to_end(number)
+            return page
+        page = self._decode(number)
+        self._remember(page)
+        return page
+
+    def _remember(self, page):
+        # puts a page in the cache, writing back the least recently used pages beyond its capacity
+        self.cache[page.number] = page
+        self.cache.move_to_end(page.number)
+        while len(self.cache) > self.cachePages:
+            number, evicted = self.cache.popitem(last=False)
+            if evicted.dirty:
+                self._flushPage(evicted)
+
+    def _flushPage(self, page):
+        # the original page must be safely in the journal before the file is overwritten
+        self._syncJournal()
+        self._encode(page)
+        page.dirty = False
+
+    def _markDirty(self, page):
+        if not page.dirty:
+            if page.number < self.journalPages and page.number not in self.journaled:
+                self._journalPage(page.number)
+            page.dirty = True
+        self._remember(page)
+
+    def _allocate(self, leaf):
+        number = self.pageCount
+        self.pageCount += 1
+        needed = self.pageCount * PAGE_SIZE
+        if needed > self.fileSize:
+            # grow by a quarter at a time so that appends do not remap the file for every page
+            size = max(needed, self.fileSize + max(self.fileSize // 4, 64 * PAGE_SIZE))
+            self.mm.close()
+            self.file.truncate(size)
+            self._map()
+        page = _Page(number, leaf, [], [])
+        page.dirty = True # new pages are past the journaled size of the file, rollback cuts them off
+        self._remember(page)
+        return page
+
+    # ---------------------------------------------------------------- transactions
+
+    def _begin(self):
+        # starts a transaction on the first change: the journal records the size of the file and the header
+        if self.journal is not None:
+            return
+        self.journal = open(self.journalPath, "wb")
+        self.journal.write(_JOURNAL_HEADER.pack(_JOURNAL_MAGIC, PAGE_SIZE, self.fileSize))
+        self.journalPages = self.pageCount
+        self.journaled = set()
+        self._journalPage(0)
+        _fsyncDirectory(self.journalPath)
+
+    def _journalPage(self, number):
+        offset = number * PAGE_SIZE
+        self.journal.write(_JOURNAL_PAGE.pack(number))
+        self.journal.write(self.mm[offset:offset + PAGE_SIZE])
+        self.journaled.add(number)
+        self.journalSynced = False
+
+    def _syncJournal(self):
+        if not self.journalSynced:
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+            self.journalSynced = True
+
+    def commit(self):
+        """
+        Writes all the changes of the current transaction to the file and makes them durable.
+        """
+        if self.journal is None:
+            return
+        self._syncJournal()
+        for page in self.cache.values():
+            if page.dirty:
+                self._encode(page)
+                page.dirty = False
+        self._writeHeader()
+        self.mm.flush()
+        os.fsync(self.file.fileno())
+        self.journal.close()
+        self.journal = None
+        os.remove(self.journalPath) # the commit point
+        _fsyncDirectory(self.journalPath)
+
+    def rollback(self):
+        """
+        Discards the changes made since the last commit.
+        """
+        if self.journal is None:
+            return
+        self.journal.close()
+        self.journal = None
+        self.cache.clear()
+        self.mm.close()
+        self._recover()
+        self._map()
+        self._readHeader()
+
+    def _recover(self):
+        # copies the journaled pages back and cuts the file to its size before the transaction;
+        # a journal without a complete header was never synced, so the file was not touched yet
+        with open(self.journalPath, "rb") as journal:
+            data = journal.read()
+        if len(data) >= _JOURNAL_HEADER.size:
+            magic, pageSize, fileSize = _JOURNAL_HEADER.unpack_from(data, 0)
+            if magic == _JOURNAL_MAGIC and pageSize == PAGE_SIZE:
+                record = _JOURNAL_PAGE.size + PAGE_SIZE
+                offset = _JOURNAL_HEADER.size
+                while offset + record <= len(data): # an incomplete last record was never synced either
+                    number = _JOURNAL_PAGE.unpack_from(data, offset)[0]
+                    self.file.seek(number * PAGE_SIZE)
+                    self.file.write(data[offset + _JOURNAL_PAGE.size:offset + record])
+                    offset += record
+                self.file.truncate(fileSize)
+                self.file.flush()
+                os.fsync(self.file.fileno())
+        os.remove(self.journalPath)
+        _fsyncDirectory(self.journalPath)
+
+    def close(self):
+        """
+        Commits pending changes and closes the file.
+        """
+        if self.file.closed:
+            return
+        self.commit()
+        self.cache.clear()
+        self.mm.close()
+        self.file.close()
+
+    # ---------------------------------------------------------------- tree operations
+
+    def _findLeaf(self, key):
+        # returns the leaf that may hold key and the (page, child index) pairs on the way down
+        path = []
+        page = self._page(self.root)
+        while not page.leaf:
+            i = bisect_right(page.keys, key)
+            path.append((page, i))
+            page = self._page(page.values[i])
+        return page, path
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored for key, or default.
+        """
+        page = self._findLeaf(key)[0]
+        i = bisect_left(page.keys, key)
+        if i < len(page.keys) and page.keys[i] == key:
+            return page.values[i]
+        return default
+
+    def search(self, key):
+        return key in self
+
+    def insert(self, key, value):
+        """
+        Adds key with the given value, or replaces the value if key is already present.
+        """
+        key = _int64(key, "key")
+        value = _int64(value, "value")
+        self._begin()
+        page, path = self._findLeaf(key)
+        i = bisect_left(page.keys, key)
+        if i < len(page.keys) and page.keys[i] == key:
+            page.values[i] = value
+            self._markDirty(page)
+            return
+        page.keys.insert(i, key)
+        page.values.insert(i, value)
+        self._markDirty(page)
+        self.count += 1
+        if len(page.keys) > LEAF_CAPACITY:
+            self._split(page, path, i == len(page.keys) - 1)
+
+    def _split(self, page, path, appending):
+        # splits an overfull page and moves the separator into the parent, splitting upwards as needed;
+        # when keys are appended at the right end the left page is left full instead of half full
+        while True:
+            newPage = self._allocate(page.leaf)
+            if page.leaf:
+                middle = len(page.keys) - 1 if appending and page.next == _NO_PAGE else len(page.keys) // 2
+                newPage.keys, page.keys = page.keys[middle:], page.keys[:middle]
+                newPage.values, page.values = page.values[middle:], page.values[:middle]
+                newPage.next, page.next = page.next, newPage.number
+                separator = newPage.keys[0]
+            else:
+                middle = len(page.keys) - 2 if appending else len(page.keys) // 2
+                separator = page.keys[middle]
+                newPage.keys, page.keys = page.keys[middle + 1:], page.keys[:middle]
+                newPage.values, page.values = page.values[middle + 1:], page.values[:middle + 1]
+            self._markDirty(page)
+            if not path:
+                root = self._allocate(False)
+                root.keys = [separator]
+                root.values = [page.number, newPage.number]
+                self.root = root.number
+                self.height += 1
+                return
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.values.insert(i + 1, newPage.number)
+            self._markDirty(parent)
+            if len(parent.keys) <= INTERNAL_CAPACITY:
+                return
+            appending = appending and i == len(parent.keys) - 1
+            page = parent
+
+    def delete(self, key):
+        """
+        Removes key from its leaf. Returns False if it was not present. Pages are not merged when they
+        become sparse, as in many databases; bulk loading into a new file compacts the tree.
+        """
+        page = self._findLeaf(key)[0]
+        i = bisect_left(page.keys, key)
+        if i == len(page.keys) or page.keys[i] != key:
+            return False
+        self._begin()
+        del page.keys[i]
+        del page.values[i]
+        self._markDirty(page)
+        self.count -= 1
+        return True
+
+    def iterRange(self, low=None, high=None):
+        """
+        Yields the (key, value) pairs with low <= key <= high in key order, following the leaf links;
+        None leaves that side open. The tree must not be changed while iterating.
+        """
+        if low is None:
+            page, i = self._page(self.firstLeaf), 0
+        else:
+            page = self._findLeaf(low)[0]
+            i = bisect_left(page.keys, low)
+        while True:
+            keys, values = page.keys, page.values
+            end = len(keys) if high is None else bisect_right(keys, high)
+            for j in range(i, end):
+                yield keys[j], values[j]
+            if end < len(keys) or page.next == _NO_PAGE:
+                return
+            page, i = self._page(page.next), 0
+
+    def items(self):
+        return self.iterRange()
+
+    def bulkLoad(self, items, fill=1.0):
+        """
+        Builds the tree bottom-up from (key, value) pairs sorted by strictly increasing key, writing every
+        page once. Only allowed on an empty tree. fill sets how full the pages are left, to leave room
+        for later insertions. If an item is rejected, the tree is left empty as it was.
+        """
+        if self.count:
+            raise ValueError("bulkLoad needs an empty tree")
+        if not 0 < fill <= 1:
+            raise ValueError("fill must be in (0, 1]")
+        self._begin()
+        saved = (self.root, self.pageCount, self.count, self.firstLeaf, self.height)
+        try:
+            self._bulkLoad(items, fill)
+        except BaseException:
+            # forget the pages built so far: they are past the saved page count, so they are simply unused
+            self.root, self.pageCount, self.count, self.firstLeaf, self.height = saved
+            for number in [number for number in self.cache if number >= self.pageCount]:
+                del self.cache[number]
+            if self.height == 1: # the empty root leaf may have been filled already
+                root = self._page(self.root)
+                root.keys, root.values, root.next = [], [], _NO_PAGE
+                self._markDirty(root)
+            raise
+
+    def _bulkLoad(self, items, fill):
+        leafSize = max(1, int(LEAF_CAPACITY * fill))
+        level = [] # (first key, page number) of every page of the level being built
+        page = None
+        previous = None
+        for key, value in items:
+            key = _int64(key, "key")
+            value = _int64(value, "value")
+            if previous is not None and key <= previous:
+                raise ValueError("bulkLoad needs keys in strictly increasing order")
+            previous = key
+            if page is None and self.height == 1:
+                # the tree is a single empty leaf: it becomes the first leaf instead of being left unused
+                page = self._page(self.root)
+                page.next = _NO_PAGE
+                self._markDirty(page)
+                self.firstLeaf = page.number
+                level.append((key, page.number))
+            elif page is None or len(page.keys) == leafSize:
+                newPage = self._allocate(True)
+                if page is None:
+                    self.firstLeaf = newPage.number
+                else:
+                    page.next = newPage.number
+                    self._markDirty(page)
+                page = newPage
+                level.append((key, page.number))
+            page.keys.append(key)
+            page.values.append(value)
+            self.count += 1
+        if page is None:
+            return
+        self.height = 1
+        childrenSize = max(2, int((INTERNAL_CAPACITY + 1) * fill))
+        while len(level) > 1:
+            parents = []
+            for start in range(0, len(level), childrenSize):
+                children = level[start:start + childrenSize]
+                parent = self._allocate(False)
+                parent.keys = [firstKey for firstKey, number in children[1:]]
+                parent.values = [number for firstKey, number in children]
+                parents.append((children[0][0], parent.number))
+            level = parents
+            self.height += 1
+        self.root = level[0][1]
+
+_NO_VALUE = object()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "index.db")
+    with BPlusTree(path) as tree:
+        tree.bulkLoad((key, key * key) for key in range(0, 100000, 2))
+    with BPlusTree(path) as tree:
+        print(len(tree), tree.height, tree.get(512), tree.get(513))
+        print(list(tree.iterRange(10, 20)))
+        tree.insert(513, 1)
+        tree.rollback()
+        print(513 in tree)
+        tree.insert(513, 1)
+    with BPlusTree(path) as tree:
+        print(513 in tree, tree.delete(512), tree.get(512))
@@ -30,120 +30,597 @@ Time complexity (worst case):
     - Deletion: O(n)
 """
 
+import functools
+import mmap
+import pickle
+import struct
+import sys
+import time
+from array import array
+
+_FREE = -1  # index slot that has never been used
+_DUMMY = -2  # index slot whose entry was deleted (tombstone)
+_DELETED = object()  # placeholder left in the entries arrays by delete()
+_MIN_SIZE = 8
+_PERTURB_SHIFT = 5
+_UINT64 = (1 << 64) - 1
+# snapshot header: magic, index size, live keys, hash probe, pickled payload length
+_SNAPSHOT_HEADER = struct.Struct("<8sqqqq")
+_SNAPSHOT_MAGIC = b"HMAPSNP1"
+_SNAPSHOT_PROBE = "HashMap snapshot probe"
+_MISSING = object()
+_KWD_MARK = object()  # separates positional from keyword arguments in memoize keys
+
+
 class HashMap:
-    def __init__(self):
-        self.size = 10
-        self.map = [None] * self.size
-        
+    """
+    Open-addressing hash map with a compact index-plus-entries layout.
+
+    The index is a power-of-two sized array of slots pointing into three dense
+    entry arrays (hashes, keys, values), so iteration never walks empty slots and
+    the per-key overhead stays small. Collisions are resolved with perturbed
+    probing, deletions leave tombstones that are dropped on the next resize, and
+    the table grows once two thirds of the index is in use.
+    """
+    def __init__(self, size=_MIN_SIZE):
+        self.size = _MIN_SIZE
+        while self.size < size:
+            self.size <<= 1
+        self.indices = array("q", [_FREE]) * self.size
+        self.hashes = []
+        self._keys = []
+        self._values = []
+        self.used = 0
+
+    def __len__(self):
+        return self.used
+
+    def __contains__(self, key):
+        return self._lookup(key, self._get_hash(key))[0] >= 0
+
+    def __iter__(self):
+        return self.iterkeys()
+
     def _get_hash(self, key):
         """
-        The function calculates the hash value of a given key by summing the ASCII values of its
-        characters and returning the remainder when divided by the size of the hash table.
+        The function calculates the hash value of a given key with the built-in hash(), which
+        spreads permutations of the same characters across the table instead of summing them.
         
-        :param key: The key parameter is the value that we want to hash. It can be any data type that
-        can be converted to a string, such as a string, integer, or float
-        :return: The code is returning the hash value of the given key.
+        :param key: The key parameter is the value that we want to hash. It can be any hashable type
+        :return: The code is returning the full hash value of the given key; the probing code masks it
+        down to a slot of the index.
         """
-        hash = 0
-        for char in str(key):
-            hash += ord(char)
-        return hash % self.size
-    
+        return hash(key)
+
+    def _lookup(self, key, key_hash):
+        """
+        The function probes the index for a key.
+        
+        :param key: The key to look for.
+        :param key_hash: The precomputed hash of the key.
+        :return: A pair (entry, slot). entry is the position of the key in the entry arrays, or -1
+        if it is missing, in which case slot is the index slot where it should be inserted.
+        """
+        indices = self.indices
+        mask = self.size - 1
+        perturb = key_hash & _UINT64
+        slot = key_hash & mask
+        free_slot = -1
+        while True:
+            entry = indices[slot]
+            if entry == _FREE:
+                return -1, (slot if free_slot < 0 else free_slot)
+            if entry == _DUMMY:
+                if free_slot < 0:
+                    free_slot = slot
+            elif self.hashes[entry] == key_hash:
+                found = self._keys[entry]
+                if found is key or found == key:
+                    return entry, slot
+            perturb >>= _PERTURB_SHIFT
+            slot = (slot * 5 + perturb + 1) & mask
+
+    def _resize(self, min_used):
+        """
+        The function rebuilds the index for at least min_used live keys. Deleted entries are
+        compacted out of the entry arrays and every tombstone disappears with the old index.
+        
+        :param min_used: The number of live keys the new table must hold below its load factor.
+        :return: The function does not return anything.
+        """
+        size = _MIN_SIZE
+        while size * 2 <= min_used * 3:
+            size <<= 1
+        if self.used != len(self.hashes):
+            live = [i for i, k in enumerate(self._keys) if k is not _DELETED]
+            self.hashes = [self.hashes[i] for i in live]
+            self._keys = [self._keys[i] for i in live]
+            self._values = [self._values[i] for i in live]
+        indices = array("q", [_FREE]) * size
+        mask = size - 1
+        for entry, key_hash in enumerate(self.hashes):
+            perturb = key_hash & _UINT64
+            slot = key_hash & mask
+            while indices[slot] != _FREE:
+                perturb >>= _PERTURB_SHIFT
+                slot = (slot * 5 + perturb + 1) & mask
+            indices[slot] = entry
+        self.size = size
+        self.indices = indices
+
     def add(self, key, value):
         """
-        The function adds a key-value pair to the hash table. It first calculates the hash value of the
-        key, then creates a list at that index in the hash table if one does not exist. It then appends
-        the key-value pair to the list.
+        The function adds a key-value pair to the hash table. If the key is already present its value
+        is replaced in place, otherwise the pair is appended to the entry arrays and its position is
+        stored in the first free or tombstone slot of its probe sequence. The table grows before the
+        entry arrays fill two thirds of the index.
         
         :param key: The key parameter is the key of the key-value pair to be added to the hash table.
         :param value: The value parameter is the value of the key-value pair to be added to the hash table.
-        :return: The function does not return anything.
+        :return: The function returns True.
         """
         key_hash = self._get_hash(key)
-        key_value = [key, value]
-        
-        if self.map[key_hash] is None: # if the key does not exist in the hash table
-            self.map[key_hash] = list([key_value])
-            return True
-        else: # if the key already exists in the hash table
-            for pair in self.map[key_hash]:
-                if pair[0] == key:
-                    pair[1] = value
-                    return True
-            self.map[key_hash].append(key_value)
+        entry, slot = self._lookup(key, key_hash)
+        if entry >= 0:
+            self._values[entry] = value
             return True
+        if (len(self.hashes) + 1) * 3 > self.size * 2:
+            self._resize((self.used + 1) * 2)
+            entry, slot = self._lookup(key, key_hash)
+        self.indices[slot] = len(self.hashes)
+        self.hashes.append(key_hash)
+        self._keys.append(key)
+        self._values.append(value)
+        self.used += 1
+        return True
+
+    def _reserve(self, count):
+        """
+        The function grows the table once so that count more keys fit without further resizes.
         
-    def get(self, key):
+        :param count: The number of keys about to be inserted.
+        :return: The function does not return anything.
         """
-        The function returns the value of a given key from the hash table. It first calculates the
-        hash value of the key, then iterates through the list at that index in the hash table until
-        it finds the key-value pair with the matching key. It then returns the value from that pair.
+        if (len(self.hashes) + count) * 3 > self.size * 2:
+            self._resize(self.used + count)
+
+    def update(self, pairs):
+        """
+        The function adds many key-value pairs at once. When the number of pairs is known the table
+        is presized with a single resize, and the insert loop works on local references so every pair
+        costs one hash and one probe sequence.
+        
+        :param pairs: A mapping with an items() method, or an iterable of (key, value) pairs.
+        :return: The function returns the number of pairs processed.
+        """
+        if hasattr(pairs, "items"):
+            pairs = pairs.items()
+        try:
+            self._reserve(len(pairs))
+        except TypeError:  # generators and other iterables without a length
+            pass
+        lookup = self._lookup
+        get_hash = self._get_hash
+        count = 0
+        for key, value in pairs:
+            key_hash = get_hash(key)
+            entry, slot = lookup(key, key_hash)
+            count += 1
+            if entry >= 0:
+                self._values[entry] = value
+                continue
+            if (len(self.hashes) + 1) * 3 > self.size * 2:
+                self._resize((self.used + 1) * 2)
+                entry, slot = lookup(key, key_hash)
+            self.indices[slot] = len(self.hashes)
+            self.hashes.append(key_hash)
+            self._keys.append(key)
+            self._values.append(value)
+            self.used += 1
+        return count
+
+    def get_many(self, keys, default=None):
+        """
+        The function looks up many keys in one call.
+        
+        :param keys: An iterable of keys to look up.
+        :param default: The value returned for every missing key.
+        :return: The function returns a list with the value (or default) of each key, in the same order.
+        """
+        lookup = self._lookup
+        get_hash = self._get_hash
+        values = self._values
+        result = []
+        append = result.append
+        for key in keys:
+            entry = lookup(key, get_hash(key))[0]
+            append(values[entry] if entry >= 0 else default)
+        return result
+
+    def delete_many(self, keys):
+        """
+        The function deletes many keys in one call. Tombstones are left as with delete(), and the
+        table is shrunk at most once at the end instead of after every key.
+        
+        :param keys: An iterable of keys to delete; missing keys are ignored.
+        :return: The function returns the number of keys that were deleted.
+        """
+        lookup = self._lookup
+        get_hash = self._get_hash
+        indices = self.indices
+        deleted = 0
+        for key in keys:
+            entry, slot = lookup(key, get_hash(key))
+            if entry < 0:
+                continue
+            indices[slot] = _DUMMY
+            self._keys[entry] = _DELETED
+            self._values[entry] = None
+            deleted += 1
+        self.used -= deleted
+        if self.used * 8 < len(self.hashes) and self.size > _MIN_SIZE:
+            self._resize(self.used * 2)
+        return deleted
+
+    def save(self, path):
+        """
+        The function writes a binary snapshot of the hash table to a file. The snapshot holds the
+        raw index and hash arrays followed by the pickled keys and values, so load() can map the index
+        back without rehashing anything. Tombstones are compacted away before writing.
+        
+        :param path: The path of the snapshot file to write.
+        :return: The function does not return anything.
+        """
+        if self.used != len(self.hashes):
+            self._resize(self.used)
+        payload = pickle.dumps((self._keys, self._values), protocol=pickle.HIGHEST_PROTOCOL)
+        with open(path, "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, self.size, self.used,
+                                          hash(_SNAPSHOT_PROBE), len(payload)))
+            f.write(self.indices.tobytes())
+            f.write(array("q", self.hashes).tobytes())
+            f.write(payload)
+
+    @classmethod
+    def load(cls, path):
+        """
+        The function restores a hash table from a snapshot written by save(). The file is memory-mapped
+        copy-on-write and the index is used in place, so only the pages touched by later writes are
+        copied. The stored index is only valid if every key still has the hash it had when it was saved:
+        a different string hash seed, or keys hashed by identity such as None, classes or functions, get
+        new hashes in a new process. The keys are rehashed on load, and on any mismatch the pairs are
+        reinserted into a presized table instead.
+        
+        :param path: The path of the snapshot file to read.
+        :return: The function returns the restored HashMap.
+        """
+        with open(path, "rb") as f:
+            snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, size, used, probe, payload_length = _SNAPSHOT_HEADER.unpack_from(snapshot)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("Not a HashMap snapshot: " + str(path))
+        offset = _SNAPSHOT_HEADER.size
+        hashes_offset = offset + size * 8
+        payload_offset = hashes_offset + used * 8
+        keys, values = pickle.loads(snapshot[payload_offset:payload_offset + payload_length])
+        table = cls()
+        hashes = None
+        if probe == hash(_SNAPSHOT_PROBE): # cheap check first: the string hash seed did not change
+            hashes = [table._get_hash(key) for key in keys]
+            if array("q", hashes) != array("q", snapshot[hashes_offset:payload_offset]):
+                hashes = None
+        if hashes is None:
+            snapshot.close()
+            table.update(zip(keys, values))
+            return table
+        view = memoryview(snapshot)
+        table.size = size
+        table.indices = view[offset:hashes_offset].cast("q")
+        table.hashes = hashes
+        table._keys = keys
+        table._values = values
+        table.used = used
+        return table
+
+    def get(self, key, default=None):
+        """
+        The function returns the value of a given key from the hash table by probing the index from
+        the slot selected by the key's hash until it meets the key or a never-used slot.
         
         :param key: The key parameter is the key of the key-value pair to be retrieved from the hash table.
+        :param default: The value returned when the key is missing.
         :return: The function returns the value of the key-value pair with the given key.
         """
-        key_hash = self._get_hash(key)
-        if self.map[key_hash] is not None:
-            for pair in self.map[key_hash]:
-                if pair[0] == key:
-                    return pair[1]
-        return None
-    
+        entry = self._lookup(key, self._get_hash(key))[0]
+        if entry < 0:
+            return default
+        return self._values[entry]
+
     def delete(self, key):
         """
-        The function deletes a key-value pair from the hash table. It first calculates the hash value
-        of the key, then iterates through the list at that index in the hash table until it finds the
-        key-value pair with the matching key. It then removes the pair from the list.
+        The function deletes a key-value pair from the hash table. The index slot becomes a tombstone
+        so that probe sequences running through it stay intact, and the entry is blanked until the
+        next resize compacts the entry arrays.
         
         :param key: The key parameter is the key of the key-value pair to be deleted from the hash table.
-        :return: The function does not return anything.
+        :return: The function returns True if the key was deleted, False if it was not present.
         """
-        key_hash = self._get_hash(key)
-        
-        if self.map[key_hash] is None:
+        entry, slot = self._lookup(key, self._get_hash(key))
+        if entry < 0:
             return False
-        for i in range(0, len(self.map[key_hash])):
-            if self.map[key_hash][i][0] == key:
-                self.map[key_hash].pop(i)
-                return True
-            
+        self.indices[slot] = _DUMMY
+        self._keys[entry] = _DELETED
+        self._values[entry] = None
+        self.used -= 1
+        if self.used * 8 < len(self.hashes) and self.size > _MIN_SIZE:
+            self._resize(self.used * 2)
+        return True
+
+    def items(self):
+        """
+        The function returns an iterator over all the key-value pairs in the hash table, in insertion order.
+        """
+        for key, value in zip(self._keys, self._values):
+            if key is not _DELETED:
+                yield key, value
+
     def print(self):
         """
         The function prints all the key-value pairs in the hash table.
         
         :return: The function does not return anything.
         """
-        for item in self.map:
-            if item is not None:
-                print(str(item))
+        for key, value in self.items():
+            print(str([key, value]))
                 
     def keys(self):
         """
-        The function returns a list of all the keys in the hash table.
+        The function returns a list of all the keys in the hash table, in insertion order.
         
         :return: The function returns a list of all the keys in the hash table.
         """
-        keys = []
-        for item in self.map:
-            if item is not None:
-                # print(item)
-                for pair in item:
-                    keys.append(pair[0])
-        return keys
+        return list(self.iterkeys())
     
     def values(self):
         """
-        The function returns a list of all the values in the hash table.
+        The function returns a list of all the values in the hash table, in insertion order.
         
         :return: The function returns a list of all the values in the hash table.
         """
-        values = []
-        for item in self.map:
-            if item is not None:
-                for pair in item:
-                    values.append(pair[1])
-        return values
+        return list(self.itervalues())
+    
+    def iterkeys(self):
+        """
+        The function returns an iterator over all the keys in the hash table, in insertion order.
+        
+        :return: The function returns an iterator over the entry arrays; no intermediate lists are built.
+        """
+        if self.used == len(self._keys):
+            return iter(self._keys)
+        return (key for key in self._keys if key is not _DELETED)
+    
+    def itervalues(self):
+        """
+        The function returns an iterator over all the values in the hash table, in insertion order.
+        
+        :return: The function returns an iterator over the entry arrays; no intermediate lists are built.
+        """
+        if self.used == len(self._values):
+            return iter(self._values)
+        return (value for key, value in zip(self._keys, self._values) if key is not _DELETED)
+    
+class CacheNode:
+    # each node holds one cache entry and pointers to its neighbours in the recency list
+    __slots__ = ("key", "value", "size", "expires", "prev", "next")
+
+    def __init__(self, key=None, value=None, size=0, expires=None):
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.prev = self
+        self.next = self
+
+
+class LRUCache:
+    """
+    Bounded cache that pairs a HashMap (key -> node) with a circular doubly linked recency list.
+    The most recently used entry sits right after the sentinel root node and the least recently
+    used one right before it, so lookups, moves to the front and evictions are all O(1).
+    
+    Entries are evicted in least-recently-used order once max_entries or max_bytes is exceeded
+    (None disables either limit), and entries with a time to live expire lazily when they are next looked up.
+    """
+    def __init__(self, max_entries=128, max_bytes=None, ttl=None, size_of=sys.getsizeof, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_of = size_of
+        self.clock = clock
+        self.map = HashMap()
+        self.root = CacheNode()  # sentinel: root.next is the newest entry, root.prev the oldest
+        self.bytes = 0
+        self.expiring = 0  # number of entries with a time to live
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        # expired entries are dropped first, so they are not counted before they are looked up
+        if self.expiring:
+            self.purge_expired()
+        return len(self.map)
+
+    def __contains__(self, key):
+        node = self.map.get(key)
+        return node is not None and (node.expires is None or node.expires > self.clock())
+
+    def _unlink(self, node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def _push_front(self, node):
+        root = self.root
+        node.prev = root
+        node.next = root.next
+        root.next.prev = node
+        root.next = node
+
+    def _remove(self, node):
+        self._unlink(node)
+        self.map.delete(node.key)
+        self.bytes -= node.size
+        if node.expires is not None:
+            self.expiring -= 1
+
+    def get(self, key, default=None):
+        """
+        The function returns the cached value of a key and marks it as the most recently used entry.
+        
+        :param key: The key to look up.
+        :param default: The value returned on a miss.
+        :return: The function returns the cached value, or default if the key is missing or expired.
+        """
+        node = self.map.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        if node.expires is not None and node.expires <= self.clock():
+            self._remove(node)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        if node.prev is not self.root:
+            self._unlink(node)
+            self._push_front(node)
+        self.hits += 1
+        return node.value
+
+    def put(self, key, value, ttl=None):
+        """
+        The function stores a value as the most recently used entry, then evicts the least recently
+        used entries until the cache fits its limits again.
+        
+        :param key: The key to store.
+        :param value: The value to store.
+        :param ttl: Seconds until the entry expires; defaults to the ttl given to the cache.
+        :return: The function returns False if the entry alone is larger than max_bytes and was not
+        cached, True otherwise.
+        """
+        size = self.size_of(key) + self.size_of(value) if self.max_bytes is not None else 0
+        node = self.map.get(key)
+        if node is not None:
+            self._remove(node)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+        if ttl is None:
+            ttl = self.ttl
+        node = CacheNode(key, value, size, None if ttl is None else self.clock() + ttl)
+        self.map.add(key, node)
+        self._push_front(node)
+        self.bytes += size
+        if node.expires is not None:
+            self.expiring += 1
+        root = self.root
+        while ((self.max_entries is not None and len(self.map) > self.max_entries)
+               or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            self._remove(root.prev)
+            self.evictions += 1
+        return True
+
+    def delete(self, key):
+        """
+        The function removes a key from the cache.
+        
+        :param key: The key to remove.
+        :return: The function returns True if the key was cached, False otherwise.
+        """
+        node = self.map.get(key)
+        if node is None:
+            return False
+        self._remove(node)
+        return True
+
+    def purge_expired(self):
+        """
+        The function removes every expired entry instead of waiting for them to be looked up.
+        
+        :return: The function returns the number of entries removed.
+        """
+        now = self.clock()
+        expired = []
+        node = self.root.next
+        while node is not self.root:
+            if node.expires is not None and node.expires <= now:
+                expired.append(node)
+            node = node.next
+        for node in expired:
+            self._remove(node)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        """
+        The function removes every entry but keeps the counters.
+        """
+        self.map = HashMap()
+        self.root.prev = self.root.next = self.root
+        self.bytes = 0
+        self.expiring = 0
+
+    def stats(self):
+        """
+        The function returns the cache counters.
+        
+        :return: A dictionary with the hits, misses, evictions, expirations, entries and bytes.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self),
+            "bytes": self.bytes,
+        }
+
+    def memoize(self, func):
+        """
+        The function is a decorator that caches the results of func in this cache, keyed by its
+        positional and keyword arguments (which must be hashable).
+        
+        :param func: The function whose results should be cached.
+        :return: The wrapped function; the cache is reachable through its cache attribute.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args
+            if kwargs:
+                # the private marker keeps f(a=1) apart from any call made with positional arguments only
+                key += (_KWD_MARK,)
+                for item in sorted(kwargs.items()):
+                    key += item
+            result = self.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                self.put(key, result)
+            return result
+        wrapper.cache = self
+        return wrapper
+
+
+def memoize(max_entries=128, max_bytes=None, ttl=None):
+    """
+    The function builds a decorator that caches a function's results in a new LRUCache.
     
+    :param max_entries: The maximum number of cached results, or None for no limit.
+    :param max_bytes: The maximum estimated size of the cached keys and results, or None.
+    :param ttl: Seconds a cached result stays valid, or None to keep it until evicted.
+    :return: A decorator; see LRUCache.memoize.
+    """
+    return LRUCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl).memoize
+
+
 if __name__ == "__main__":
     h = HashMap()
     h.add('Bob', '567-8888')
@@ -159,4 +636,17 @@ if __name__ == "__main__":
     h.print()
     print('Ming: ' + h.get('Ming'))
     print(h.keys())
-    print(h.values())
\ No newline at end of file
+    print(h.values())
+    
+    cache = LRUCache(max_entries=2)
+    cache.put('Bob', '567-8888')
+    cache.put('Ming', '293-6753')
+    cache.get('Bob')
+    cache.put('Ankit', '293-8625')  # evicts Ming, the least recently used entry
+    print(cache.get('Ming'), cache.get('Bob'))
+    print(cache.stats())
+    
+    @memoize(max_entries=8)
+    def describe(*args, **kwargs):
+        return (args, kwargs)
+    print(describe((), (('a', 1),)), describe(a=1))  # different calls, different cache entries
@@ -0,0 +1,342 @@
+"""
+Quick summary:
+    a tree-shaped collection where every parent is smaller than its children, so the smallest item is always
+    at the root.
+Also known as:
+    priority queue, min heap (max heap when every parent is larger).
+Important facts:
+    - A heap is a complete tree stored in an array without pointers: in a d-ary heap the children of
+      index i are at d*i + 1 ... d*i + d and its parent is at (i - 1) // d. A binary heap has d = 2.
+    - Pushing appends the item and moves it up while it is smaller than its parent (sift up).
+    - Popping takes the root, moves the last item to the root and moves it down while a child is
+      smaller (sift down).
+    - Heapify builds a heap from n items in O(n) by sifting down every parent, from the last one to the root.
+    - A larger d makes the tree shallower, so pushes and decrease-key are cheaper, but each sift down step
+      compares d children. 4-ary heaps are often faster than binary heaps in practice.
+    - An indexed priority queue also remembers where every item is in the array, so the priority of any
+      item can be changed, or the item removed, in O(log(n)).
+Pros:
+    - The smallest item is available in O(1), and pushing and popping are O(log(n)).
+    - No pointers: the whole heap is one array.
+Cons:
+    - Only the smallest item is easy to find: searching for any other item is O(n).
+    - Items come out in sorted order only by popping them one at a time.
+Notable uses:
+    - Schedulers and timers.
+    - Shortest path (Dijkstra) and minimum spanning tree (Prim) algorithms.
+    - Keeping the k largest items of a stream.
+    - Heap sort.
+Time complexity (worst case):
+    - Peek: O(1)
+    - Push: O(log(n))
+    - Pop: O(log(n))
+    - Heapify: O(n)
+    - Decrease key / remove (indexed): O(log(n))
+"""
+
+
+class DaryHeap:
+    # min heap where every node has up to d children; items are compared with < only
+    def __init__(self, d=2, items=None):
+        if d < 2:
+            raise ValueError("a heap needs d >= 2, got " + str(d))
+        self.d = d
+        self.items = []
+        if items is not None:
+            self.heapify(items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __str__(self):
+        return " ".join([str(i) for i in self.items])
+
+    def _siftUp(self, index):
+        # moves the parents down into the hole instead of swapping, then drops the item in once
+        items, d = self.items, self.d
+        item = items[index]
+        while index > 0:
+            parent = (index - 1) // d
+            if item < items[parent]:
+                items[index] = items[parent]
+                index = parent
+            else:
+                break
+        items[index] = item
+
+    def _siftDown(self, index):
+        items, d = self.items, self.d
+        size = len(items)
+        item = items[index]
+        while True:
+            first = d * index + 1
+            if first >= size:
+                break
+            smallest = first # the smallest of the children
+            for child in range(first + 1, min(first + d, size)):
+                if items[child] < items[smallest]:
+                    smallest = child
+            if items[smallest] < item:
+                items[index] = items[smallest]
+                index = smallest
+            else:
+                break
+        items[index] = item
+
+    def heapify(self, items):
+        # replaces the content of the heap with items in O(n)
+        self.items = list(items)
+        for index in range((len(self.items) - 2) // self.d, -1, -1):
+            self._siftDown(index)
+
+    def push(self, item):
+        self.items.append(item)
+        self._siftUp(len(self.items) - 1)
+
+    def peek(self):
+        if not self.items:
+            raise IndexError("peek at an empty heap")
+        return self.items[0]
+
+    def pop(self):
+        if not self.items:
+            raise IndexError("pop from an empty heap")
+        last = self.items.pop()
+        if not self.items:
+            return last
+        smallest = self.items[0]
+        self.items[0] = last
+        self._siftDown(0)
+        return smallest
+
+    def pushpop(self, item):
+        # pushes item and pops the smallest item with a single sift down; returns item itself
+        # without touching the heap if it is not larger than the root
+        if self.items and self.items[0] < item:
+            item, self.items[0] = self.items[0], item
+            self._siftDown(0)
+        return item
+
+    def replace(self, item):
+        # pops the smallest item and pushes item with a single sift down; the result can be larger than item
+        if not self.items:
+            raise IndexError("replace on an empty heap")
+        smallest = self.items[0]
+        self.items[0] = item
+        self._siftDown(0)
+        return smallest
+
+
+class BinaryHeap(DaryHeap):
+    # the usual heap with two children per node
+    def __init__(self, items=None):
+        super().__init__(2, items)
+
+
+class Handle:
+    # entry of an IndexedPriorityQueue: returned by push and passed back to change or remove the item.
+    # key is (priority, insertion number), so that items with equal priorities come out first in, first out
+    __slots__ = ("item", "key", "index")
+
+    def __init__(self, item, priority, order):
+        self.item = item
+        self.key = (priority, order)
+        self.index = -1 # position in the heap array, -1 once the entry left the queue
+
+    @property
+    def priority(self):
+        return self.key[0]
+
+
+class IndexedPriorityQueue:
+    # d-ary min heap of handles that keeps every handle's position up to date, so any entry can be
+    # re-prioritized or removed in O(log(n)) without searching for it
+    def __init__(self, d=2):
+        if d < 2:
+            raise ValueError("a heap needs d >= 2, got " + str(d))
+        self.d = d
+        self.heap = []
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, handle):
+        return 0 <= handle.index < len(self.heap) and self.heap[handle.index] is handle
+
+    def _siftUp(self, index):
+        heap, d = self.heap, self.d
+        handle = heap[index]
+        while index > 0:
+            parent = (index - 1) // d
+            if handle.key < heap[parent].key:
+                heap[index] = heap[parent]
+                heap[index].index = index
+                index = parent
+            else:
+                break
+        heap[index] = handle
+        handle.index = index
+
+    def _siftDown(self, index):
+        heap, d = self.heap, self.d
+        size = len(heap)
+        handle = heap[index]
+        while True:
+            first = d * index + 1
+            if first >= size:
+                break
+            smallest = first
+            for child in range(first + 1, min(first + d, size)):
+                if heap[child].key < heap[smallest].key:
+                    smallest = child
+            if heap[smallest].key < handle.key:
+                heap[index] = heap[smallest]
+                heap[index].index = index
+                index = smallest
+            else:
+                break
+        heap[index] = handle
+        handle.index = index
+
+    def _check(self, handle):
+        if handle not in self:
+            raise KeyError("handle is not in the queue")
+
+    def push(self, item, priority):
+        # returns the handle of the new entry
+        handle = Handle(item, priority, self.counter)
+        self.counter += 1
+        handle.index = len(self.heap)
+        self.heap.append(handle)
+        self._siftUp(handle.index)
+        return handle
+
+    def peek(self):
+        # returns (item, priority) of the entry with the smallest priority
+        if not self.heap:
+            raise IndexError("peek at an empty priority queue")
+        return self.heap[0].item, self.heap[0].priority
+
+    def pop(self):
+        # removes the entry with the smallest priority and returns (item, priority)
+        if not self.heap:
+            raise IndexError("pop from an empty priority queue")
+        return self.remove(self.heap[0])
+
+    def remove(self, handle):
+        # removes any entry and returns (item, priority)
+        self._check(handle)
+        index = handle.index
+        last = self.heap.pop()
+        if last is not handle: # fill the hole with the last entry, which may have to move either way
+            self.heap[index] = last
+            last.index = index
+            self._siftUp(index)
+            if last.index == index:
+                self._siftDown(index)
+        handle.index = -1
+        return handle.item, handle.priority
+
+    def update(self, handle, priority):
+        # changes the priority of an entry in either direction
+        self._check(handle)
+        old = handle.key
+        handle.key = (priority, old[1])
+        if handle.key < old:
+            self._siftUp(handle.index)
+        else:
+            self._siftDown(handle.index)
+
+    def decrease_key(self, handle, priority):
+        # lowers the priority of an entry, as Dijkstra's algorithm does when it finds a shorter path
+        if handle.priority < priority:
+            raise ValueError("decrease_key cannot raise the priority from " + str(handle.priority)
+                             + " to " + str(priority))
+        self.update(handle, priority)
+
+
+class _Reversed:
+    # inverts the order of an entry, so that the min heap of TopK keeps the smallest items instead
+    __slots__ = ("entry",)
+
+    def __init__(self, entry):
+        self.entry = entry
+
+    def __lt__(self, other):
+        return other.entry < self.entry
+
+
+class TopK:
+    # keeps the k largest items (the k smallest with largest=False) of a stream in O(k) memory.
+    # The root of the min heap is the worst item kept, so most items of a long stream are rejected
+    # after a single comparison with it
+    def __init__(self, k, key=None, largest=True):
+        if k < 1:
+            raise ValueError("k must be at least 1, got " + str(k))
+        self.k = k
+        self.key = key
+        self.largest = largest
+        self.heap = DaryHeap(2)
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _entry(self, item):
+        # the counter breaks ties, so that items themselves are never compared and earlier items win
+        if self.largest:
+            entry = (item if self.key is None else self.key(item), -self.counter, item)
+        else:
+            entry = _Reversed((item if self.key is None else self.key(item), self.counter, item))
+        self.counter += 1
+        return entry
+
+    def push(self, item):
+        # returns False if the item is not among the k best seen so far
+        entry = self._entry(item)
+        if len(self.heap) < self.k:
+            self.heap.push(entry)
+            return True
+        if self.heap.items[0] < entry:
+            self.heap.replace(entry)
+            return True
+        return False
+
+    def extend(self, items):
+        for item in items:
+            self.push(item)
+
+    def peek(self):
+        # returns the worst item kept, the next one to be dropped
+        entry = self.heap.peek()
+        return (entry if self.largest else entry.entry)[2]
+
+    def items(self):
+        # returns the items kept, best first
+        entries = [entry if self.largest else entry.entry for entry in self.heap.items]
+        entries.sort(reverse=self.largest)
+        return [entry[2] for entry in entries]
+
+
+if __name__ == "__main__":
+    heap = BinaryHeap([5, 3, 8, 1, 9, 2])
+    print(heap)
+    heap.push(0)
+    print(heap.pop(), heap.pop(), heap.peek(), heap.pushpop(4), len(heap))
+
+    quaternary = DaryHeap(4, range(20, 0, -1))
+    print([quaternary.pop() for _ in range(5)])
+
+    queue = IndexedPriorityQueue()
+    handles = {name: queue.push(name, priority) for name, priority in [("a", 5), ("b", 3), ("c", 7), ("d", 1)]}
+    queue.decrease_key(handles["c"], 0)
+    queue.remove(handles["d"])
+    print([queue.pop() for _ in range(len(queue))])
+
+    top = TopK(3)
+    top.extend([5, 1, 9, 7, 3, 8])
+    print(top.items(), top.peek())
+    bottom = TopK(3, largest=False)
+    bottom.extend([5, 1, 9, 7, 3, 8])
+    print(bottom.items())
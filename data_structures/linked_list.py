@@ -1,76 +1,226 @@
+import random
+
+
 class Node:
     # each node has its data and a pointer to the next node
+    # __slots__ drops the per-instance __dict__, which makes nodes smaller and faster to create
+    __slots__ = ("data", "next")
+
     def __init__(self, data, next=None):
         self.data = data
         self.next = next
-        
+
     def setData(self, data):
         self.data = data
-        
+
     def getData(self):
         return self.data
-    
+
     def setNext(self, next):
         self.next = next
-        
+
     def getNext(self):
         return self.next
-    
-    
+
+
+class DoublyNode(Node):
+    # node of a doubly linked list: also points to the previous node, and to the list it is in
+    # (None once it was removed), so that a stale node cannot be removed twice
+    __slots__ = ("prev", "owner")
+
+    def __init__(self, data, next=None, prev=None):
+        super().__init__(data, next)
+        self.prev = prev
+        self.owner = None
+
+    def setPrev(self, prev):
+        self.prev = prev
+
+    def getPrev(self):
+        return self.prev
+
+
+class SkipNode(Node):
+    # node of a skip list: forward[i] is the next node on level i and widths[i] is how many
+    # level 0 steps that link skips; next always equals forward[0]
+    __slots__ = ("forward", "widths")
+
+    def __init__(self, data, level):
+        super().__init__(data)
+        self.forward = [None] * level
+        self.widths = [1] * level
+
+
+class NodePool:
+    # free list of unlinked nodes: lists created with a pool return the nodes they delete here and take new
+    # nodes from here, so lists with a lot of churn stop allocating. A node must not be used after it was deleted,
+    # since it may come back holding other data. A pool can be shared by several lists of the same node type.
+    def __init__(self, nodeType=Node, limit=1024):
+        self.nodeType = nodeType
+        self.limit = limit
+        self.freeNodes = []
+
+    def getNode(self, data):
+        if self.freeNodes:
+            node = self.freeNodes.pop()
+            node.data = data
+            return node
+        return self.nodeType(data)
+
+    def putNode(self, node):
+        # clears the node so that it does not keep its data or neighbours alive
+        node.data = None
+        node.next = None
+        if len(self.freeNodes) < self.limit:
+            self.freeNodes.append(node)
+
+
 class LinkedList:
-    def __init__(self):
+    # keeps a pointer to the last node and the number of nodes, so appending and len() are O(1).
+    # Nodes linked by hand with setNext after the last node, or a head set by hand, are found and counted
+    # on the next insertion; nodes spliced by hand into the middle of the list are not counted.
+    # Deleted nodes are recycled only when a NodePool is passed, since head, getNext and the caller's own
+    # node references would then see a deleted node come back holding another item
+    def __init__(self, iterable=None, pool=None):
         self.head = None
-        
+        self.tail = None
+        self.length = 0
+        self.pool = pool
+        if iterable is not None:
+            self.extend(iterable)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        temp = self.head
+        while temp:
+            yield temp.data
+            temp = temp.next
+
     def printLinkedList(self):
         temp = self.head
         while temp:
             print(temp.data, end=" ")
             temp = temp.next
-            
+
+    def _newNode(self, data):
+        return Node(data) if self.pool is None else self.pool.getNode(data)
+
+    def _syncTail(self):
+        # O(1) unless nodes were linked by hand: then walks on to the real last node and counts the nodes passed
+        if self.tail is None:
+            if self.head is None:
+                return
+            temp, self.length = self.head, 1 # the whole list was linked by hand
+        elif self.tail.next is None:
+            return
+        else:
+            temp = self.tail
+        while temp.next:
+            temp = temp.next
+            self.length += 1
+        self.tail = temp
+
     def insertAtStart(self, data):
-        newNode = Node(data)
+        self._syncTail()
+        newNode = self._newNode(data)
         newNode.next = self.head
         self.head = newNode
-        
+        if self.tail is None:
+            self.tail = newNode
+        self.length += 1
+
     def insertAtEnd(self, data):
-        newNode = Node(data)
-        temp = self.head
-        while temp.next:
-            temp = temp.next
-        temp.next = newNode
-        
+        self._syncTail()
+        newNode = self._newNode(data)
+        if self.tail is None: # empty list
+            self.head = newNode
+        else:
+            self.tail.next = newNode
+        self.tail = newNode
+        self.length += 1
+
+    def extend(self, iterable):
+        # links the new nodes into a chain first, then attaches the whole chain to the tail at once
+        first = last = None
+        count = 0
+        getNode = self._newNode
+        for data in iterable:
+            newNode = getNode(data)
+            if last is None:
+                first = newNode
+            else:
+                last.next = newNode
+            last = newNode
+            count += 1
+        if first is None:
+            return
+        self._syncTail()
+        if self.tail is None:
+            self.head = first
+        else:
+            self.tail.next = first
+        self.tail = last
+        self.length += count
+
     def insertAtPosition(self, data, position):
-        newNode = Node(data)
+        if position == 0 or self.head is None:
+            self.insertAtStart(data)
+            return
         temp = self.head
         for i in range(position-1):
             temp = temp.next
-        newNode.next = temp.next
-        temp.next = newNode
-        
+        self.insertAfterNode(temp, data)
+
     def insertAfterNode(self, prevNode, data):
-        newNode = Node(data)
+        self._syncTail()
+        newNode = self._newNode(data)
         newNode.next = prevNode.next
         prevNode.next = newNode
-        
+        if self.tail is prevNode:
+            self.tail = newNode
+        self.length += 1
+
+    def _unlinkAfter(self, prev, temp):
+        # removes temp, whose previous node is prev (None for the head), and returns it to the pool if there is one
+        if prev is None:
+            self.head = temp.next
+        else:
+            prev.next = temp.next
+        if self.tail is temp:
+            self.tail = prev
+        self.length -= 1
+        if self.pool is not None:
+            self.pool.putNode(temp)
+
     def deleteNode(self, data):
         temp = self.head
-        if temp.data == data: # if the node to be deleted is the head node
-            self.head = temp.next
-            temp = None
-            return
-        while temp: # if the node to be deleted is not the head node
+        prev = None
+        while temp: # find the node to delete and the node before it
             if temp.data == data:
                 break # temp will be the node to be deleted
             prev = temp
             temp = temp.next
         if not temp: # if the node to be deleted is not present in the linked list
             return
-        prev.next = temp.next # unlink the node from the linked list
-        temp = None
-            
+        self._unlinkAfter(prev, temp) # unlink the node from the linked list
+
     def deleteNodeAtPosition(self, position):
-        pass
-    
+        # deletes the node at the given 0-based position, if there is one
+        if position < 0:
+            return
+        temp = self.head
+        prev = None
+        for i in range(position):
+            if temp is None:
+                return
+            prev = temp
+            temp = temp.next
+        if temp is None: # the position is past the end of the linked list
+            return
+        self._unlinkAfter(prev, temp)
+
     def search(self, data):
         temp = self.head
         while temp:
@@ -78,7 +228,302 @@ class LinkedList:
                 return True
             temp = temp.next
         return False
-    
+
+
+class DoublyLinkedList:
+    # every node also points to the previous one, so a node whose reference is known can be removed in O(1),
+    # and the list can be walked and trimmed from both ends. The insert methods hand their nodes out to the
+    # caller, so nodes are not recycled through a NodePool: a removed node could come back as another item
+    def __init__(self, iterable=None):
+        self.head = None
+        self.tail = None
+        self.length = 0
+        if iterable is not None:
+            self.extend(iterable)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        temp = self.head
+        while temp:
+            yield temp.data
+            temp = temp.next
+
+    def __reversed__(self):
+        temp = self.tail
+        while temp:
+            yield temp.data
+            temp = temp.prev
+
+    def printLinkedList(self):
+        temp = self.head
+        while temp:
+            print(temp.data, end=" ")
+            temp = temp.next
+
+    def insertAtStart(self, data):
+        # returns the new node, which can later be passed to removeNode
+        newNode = self._newNode(data)
+        newNode.next = self.head
+        if self.head is None:
+            self.tail = newNode
+        else:
+            self.head.prev = newNode
+        self.head = newNode
+        self.length += 1
+        return newNode
+
+    def insertAtEnd(self, data):
+        # returns the new node, which can later be passed to removeNode
+        newNode = self._newNode(data)
+        newNode.prev = self.tail
+        if self.tail is None:
+            self.head = newNode
+        else:
+            self.tail.next = newNode
+        self.tail = newNode
+        self.length += 1
+        return newNode
+
+    def _newNode(self, data):
+        newNode = DoublyNode(data)
+        newNode.owner = self
+        return newNode
+
+    def _checkNode(self, node):
+        if node.owner is not self:
+            raise ValueError("node is not in this linked list")
+
+    def extend(self, iterable):
+        for data in iterable:
+            self.insertAtEnd(data)
+
+    def insertAfterNode(self, prevNode, data):
+        self._checkNode(prevNode)
+        newNode = self._newNode(data)
+        newNode.prev = prevNode
+        newNode.next = prevNode.next
+        if prevNode.next is None:
+            self.tail = newNode
+        else:
+            prevNode.next.prev = newNode
+        prevNode.next = newNode
+        self.length += 1
+        return newNode
+
+    def insertBeforeNode(self, nextNode, data):
+        self._checkNode(nextNode)
+        if nextNode.prev is None:
+            return self.insertAtStart(data)
+        return self.insertAfterNode(nextNode.prev, data)
+
+    def removeNode(self, node):
+        # unlinks a node of this list in O(1) and returns its data
+        self._checkNode(node)
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        self.length -= 1
+        node.prev = node.next = node.owner = None # drop the links so the node does not keep its neighbours alive
+        return node.data
+
+    def popStart(self):
+        if self.head is None:
+            raise IndexError("pop from an empty linked list")
+        return self.removeNode(self.head)
+
+    def popEnd(self):
+        if self.tail is None:
+            raise IndexError("pop from an empty linked list")
+        return self.removeNode(self.tail)
+
+    def findNode(self, data):
+        temp = self.head
+        while temp:
+            if temp.data == data:
+                return temp
+            temp = temp.next
+        return None
+
+    def deleteNode(self, data):
+        temp = self.findNode(data)
+        if temp is not None:
+            self.removeNode(temp)
+
+    def deleteNodeAtPosition(self, position):
+        # deletes the node at the given 0-based position, if there is one,
+        # walking from whichever end is closer
+        if position < 0 or position >= self.length:
+            return
+        if position < self.length // 2:
+            temp = self.head
+            for i in range(position):
+                temp = temp.next
+        else:
+            temp = self.tail
+            for i in range(self.length - 1 - position):
+                temp = temp.prev
+        self.removeNode(temp)
+
+    def search(self, data):
+        return self.findNode(data) is not None
+
+
+class SkipList:
+    # sorted linked list with extra express lanes: each node is also linked on a random number of higher levels,
+    # each level holding about p times the nodes of the one below, so search, insert and delete walk
+    # O(log n) nodes on average. The link widths make rank and select O(log n) too.
+    # Equal items are kept in insertion order. Pass a seed to get the same levels, and timings, on every run.
+    def __init__(self, iterable=None, p=0.25, maxLevel=32, seed=None):
+        self.p = p
+        self.maxLevel = maxLevel
+        self.random = random.Random(seed)
+        self.head = SkipNode(None, maxLevel) # sentinel before the first node
+        self.level = 1 # number of levels in use
+        self.length = 0
+        if iterable is not None:
+            for data in iterable:
+                self.insert(data)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        temp = self.head.forward[0]
+        while temp:
+            yield temp.data
+            temp = temp.forward[0]
+
+    def __contains__(self, data):
+        return self.search(data)
+
+    def printLinkedList(self):
+        for data in self:
+            print(data, end=" ")
+
+    def _randomLevel(self):
+        level = 1
+        while level < self.maxLevel and self.random.random() < self.p:
+            level += 1
+        return level
+
+    def _findLast(self, data, inclusive):
+        # returns the last node holding an item < data (<= data when inclusive) and its 1-based position,
+        # 0 being the head
+        temp = self.head
+        position = 0
+        for i in reversed(range(self.level)):
+            nextNode = temp.forward[i]
+            while nextNode is not None and (nextNode.data <= data if inclusive else nextNode.data < data):
+                position += temp.widths[i]
+                temp = nextNode
+                nextNode = temp.forward[i]
+        return temp, position
+
+    def insert(self, data):
+        update = [None] * self.maxLevel
+        positions = [0] * self.maxLevel
+        temp = self.head
+        position = 0
+        for i in reversed(range(self.level)):
+            nextNode = temp.forward[i]
+            while nextNode is not None and nextNode.data <= data: # after the equal items
+                position += temp.widths[i]
+                temp = nextNode
+                nextNode = temp.forward[i]
+            update[i] = temp
+            positions[i] = position
+        level = self._randomLevel()
+        for i in range(self.level, level): # new levels start as one link from the head to the end
+            update[i] = self.head
+            self.head.widths[i] = self.length + 1
+        self.level = max(self.level, level)
+
+        newNode = SkipNode(data, level)
+        for i in range(level):
+            prev = update[i]
+            skipped = position - positions[i] # nodes between prev and the new node
+            newNode.forward[i] = prev.forward[i]
+            newNode.widths[i] = prev.widths[i] - skipped
+            prev.forward[i] = newNode
+            prev.widths[i] = skipped + 1
+        for i in range(level, self.level): # links passing over the new node get one step longer
+            update[i].widths[i] += 1
+        newNode.next = newNode.forward[0]
+        update[0].next = newNode
+        self.length += 1
+
+    def deleteNode(self, data):
+        # deletes the first node holding data; returns False if there is none
+        update = [None] * self.level
+        temp = self.head
+        for i in reversed(range(self.level)):
+            nextNode = temp.forward[i]
+            while nextNode is not None and nextNode.data < data:
+                temp = nextNode
+                nextNode = temp.forward[i]
+            update[i] = temp
+        target = temp.forward[0]
+        if target is None or target.data != data:
+            return False
+        for i in range(self.level):
+            prev = update[i]
+            if prev.forward[i] is target:
+                prev.forward[i] = target.forward[i]
+                prev.widths[i] += target.widths[i] - 1
+            else:
+                prev.widths[i] -= 1
+        update[0].next = update[0].forward[0]
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+        self.length -= 1
+        return True
+
+    def search(self, data):
+        temp = self._findLast(data, False)[0].forward[0]
+        return temp is not None and temp.data == data
+
+    def rank(self, data):
+        # number of items smaller than data, which is the index of data if it is present
+        return self._findLast(data, False)[1]
+
+    def select(self, index):
+        # returns the item at the given 0-based index in sorted order
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("skip list index out of range")
+        temp = self.head
+        position = 0
+        for i in reversed(range(self.level)):
+            while temp.forward[i] is not None and position + temp.widths[i] <= index + 1:
+                position += temp.widths[i]
+                temp = temp.forward[i]
+        return temp.data
+
+    def iterRange(self, low=None, high=None):
+        # yields the items with low <= item <= high in sorted order; None leaves that side open
+        if low is None:
+            temp = self.head.forward[0]
+        else:
+            temp = self._findLast(low, False)[0].forward[0]
+        while temp is not None and (high is None or temp.data <= high):
+            yield temp.data
+            temp = temp.forward[0]
+
+    def countRange(self, low, high):
+        # number of items with low <= item <= high, from two rank queries
+        if high < low:
+            return 0
+        return self._findLast(high, True)[1] - self._findLast(low, False)[1]
+
+
 if __name__ == "__main__":
     List = LinkedList()
     List.head = Node(1)  # create the head node
@@ -90,8 +535,28 @@ if __name__ == "__main__":
     List.insertAfterNode(node2, 5)  # node2's next --> node5
     List.insertAtEnd(6)
     List.printLinkedList()
-    print()
+    print(len(List))
     List.deleteNode(3)
     List.printLinkedList()
     print()
-    print(List.search(1))
\ No newline at end of file
+    print(List.search(1))
+    List.deleteNodeAtPosition(0)
+    List.extend([7, 8])
+    List.printLinkedList()
+    print()
+
+    DList = DoublyLinkedList([1, 2, 3])
+    node4 = DList.insertAtEnd(4)
+    DList.removeNode(node4)
+    DList.insertAtStart(0)
+    DList.printLinkedList()
+    print()
+    print(list(reversed(DList)))
+
+    Skip = SkipList([5, 1, 4, 2, 3, 2], seed=0)
+    Skip.printLinkedList()
+    print()
+    print(Skip.search(4), Skip.rank(4), Skip.select(0), list(Skip.iterRange(2, 4)))
+    Skip.deleteNode(2)
+    Skip.printLinkedList()
+    print()
@@ -1,52 +1,315 @@
+import asyncio
+import threading
+import time
+
+
 class Queue:
-    def __init__(self, limit=10):
-        self.items = []
+    # circular buffer over a preallocated list: the queue wraps around the end of the list,
+    # so both enqueue and dequeue are O(1) and nothing is ever shifted
+    def __init__(self, limit=10, growable=False):
+        self.items = [None] * limit
         self.size = 0
-        self.front = None # front is the index of the first element
-        self.rear = None # rear is the index of the last element
+        self.front = 0 # front is the index of the first element
+        self.rear = limit - 1 # rear is the index of the last element
         self.limit = limit
-        
+        self.growable = growable # double the capacity instead of rejecting items when full
+
     def __str__(self):
-        return " ".join([str(i) for i in self.items])
-    
+        return " ".join([str(i) for i in self])
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self.items[(self.front + i) % self.limit]
+
     def isEmpty(self):
-        return self.items == []
-    
+        return self.size == 0
+
     def isFull(self):
         return self.size == self.limit
-    
+
     def getSize(self):
         return self.size
-    
+
+    def _grow(self, minimum):
+        # copies the items in order into a list at least twice as large, starting at index 0
+        limit = max(self.limit * 2, minimum, 1)
+        self.items = list(self) + [None] * (limit - self.size)
+        self.front = 0
+        self.rear = self.size - 1
+        self.limit = limit
+
     def enqueue(self, data):
+        # returns False instead of adding the item when the queue is full and cannot grow
         if self.isFull():
-            print("Queue is full")
-        else:
-            self.items.append(data)
-            if self.front is None:
-                self.front = self.rear = 0
-            else:
-                self.rear = self.size
-            self.size += 1
-            
+            if not self.growable:
+                return False
+            self._grow(self.size + 1)
+        self.rear = (self.rear + 1) % self.limit
+        self.items[self.rear] = data
+        self.size += 1
+        return True
+
     def dequeue(self):
         if self.isEmpty():
-            print("Queue is empty")
+            raise IndexError("dequeue from an empty queue")
+        data = self.items[self.front]
+        self.items[self.front] = None # drop the reference so the item can be freed
+        self.front = (self.front + 1) % self.limit
+        self.size -= 1
+        return data
+
+    def peek(self):
+        if self.isEmpty():
+            raise IndexError("peek at an empty queue")
+        return self.items[self.front]
+
+    def enqueue_many(self, items):
+        # copies as many items as fit with at most two slice assignments (before and after the wrap)
+        # and returns how many were added
+        items = list(items)
+        if self.growable and self.size + len(items) > self.limit:
+            self._grow(self.size + len(items))
+        count = min(len(items), self.limit - self.size)
+        if count == 0:
+            return 0
+        start = (self.rear + 1) % self.limit
+        first = min(count, self.limit - start)
+        self.items[start:start + first] = items[:first]
+        self.items[:count - first] = items[first:count]
+        self.rear = (self.rear + count) % self.limit
+        self.size += count
+        return count
+
+    def dequeue_many(self, count=None):
+        # removes and returns up to count items (all of them by default) with at most two slices
+        if count is None or count > self.size:
+            count = self.size
+        if count <= 0:
+            return []
+        first = min(count, self.limit - self.front)
+        data = self.items[self.front:self.front + first] + self.items[:count - first]
+        self.items[self.front:self.front + first] = [None] * first
+        self.items[:count - first] = [None] * (count - first)
+        self.front = (self.front + count) % self.limit
+        self.size -= count
+        return data
+
+
+class _MeteredQueue:
+    # shared state of the blocking queues: the ring buffer plus depth and wait time metrics
+    def __init__(self, limit=10):
+        self.queue = Queue(limit)
+        self.puts = 0
+        self.gets = 0
+        self.maxDepth = 0
+        self.putWaits = 0 # number of puts that had to wait for room
+        self.getWaits = 0 # number of gets that had to wait for items
+        self.putWaitTime = 0.0
+        self.getWaitTime = 0.0
+        self.batchWaiters = 0
+
+    def __len__(self):
+        return self.queue.size
+
+    def qsize(self):
+        return self.queue.size
+
+    def _recordPuts(self, count):
+        # called with the lock held after count items were added: updates the metrics and wakes consumers
+        self.puts += count
+        if self.queue.size > self.maxDepth:
+            self.maxDepth = self.queue.size
+        if count == 1:
+            self.notEmpty.notify()
         else:
-            self.items.pop(0)
-            self.size -= 1
-            if self.size == 0:
-                self.front = self.rear = None
+            self.notEmpty.notify_all()
+        if self.batchWaiters:
+            self.batchReady.notify_all()
+
+    def stats(self):
+        return {
+            "depth": self.queue.size,
+            "maxDepth": self.maxDepth,
+            "puts": self.puts,
+            "gets": self.gets,
+            "putWaits": self.putWaits,
+            "getWaits": self.getWaits,
+            "putWaitTime": self.putWaitTime,
+            "getWaitTime": self.getWaitTime,
+        }
+
+
+class ConcurrentQueue(_MeteredQueue):
+    # thread-safe bounded queue: put blocks while the queue is full (backpressure on producers)
+    # and get blocks while it is empty; both accept a timeout in seconds
+    def __init__(self, limit=10):
+        super().__init__(limit)
+        self.lock = threading.Lock()
+        self.notEmpty = threading.Condition(self.lock)
+        self.notFull = threading.Condition(self.lock)
+        self.batchReady = threading.Condition(self.lock) # get_batch callers waiting for a full batch
+
+    def _wait(self, condition, predicate, timeout):
+        # waits on condition until predicate holds; returns the time spent waiting, or None on timeout
+        start = time.monotonic()
+        if not condition.wait_for(predicate, timeout):
+            return None
+        return time.monotonic() - start
+
+    def put(self, item, block=True, timeout=None):
+        # returns False if the queue stayed full (immediately when block is False)
+        with self.notFull:
+            if self.queue.isFull():
+                if not block:
+                    return False
+                waited = self._wait(self.notFull, lambda: not self.queue.isFull(), timeout)
+                if waited is None:
+                    return False
+                self.putWaits += 1
+                self.putWaitTime += waited
+            self.queue.enqueue(item)
+            self._recordPuts(1)
+            return True
+
+    def put_many(self, items, timeout=None):
+        # adds the items in as few locked sections as possible, waiting for room when the queue is full;
+        # returns how many were added before the timeout
+        items = list(items)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        added = 0
+        with self.notFull:
+            while added < len(items):
+                if self.queue.isFull():
+                    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    waited = self._wait(self.notFull, lambda: not self.queue.isFull(), remaining)
+                    if waited is None:
+                        break
+                    self.putWaits += 1
+                    self.putWaitTime += waited
+                count = self.queue.enqueue_many(items[added:])
+                added += count
+                self._recordPuts(count)
+        return added
+
+    def get(self, block=True, timeout=None):
+        # raises IndexError if no item arrived (immediately when block is False)
+        with self.notEmpty:
+            if self.queue.isEmpty():
+                if not block:
+                    raise IndexError("get from an empty queue")
+                waited = self._wait(self.notEmpty, lambda: not self.queue.isEmpty(), timeout)
+                if waited is None:
+                    raise IndexError("get from an empty queue")
+                self.getWaits += 1
+                self.getWaitTime += waited
+            item = self.queue.dequeue()
+            self.gets += 1
+            self.notFull.notify()
+            return item
+
+    def get_batch(self, maxItems, timeout=None):
+        # returns up to maxItems items with one wakeup: without timeout, as soon as at least one item is
+        # available; with a timeout, once maxItems items are available or the deadline passes (possibly none)
+        with self.lock:
+            if timeout is None:
+                condition, predicate = self.notEmpty, lambda: not self.queue.isEmpty()
             else:
-                self.rear = self.size - 1
-                
+                batch = min(maxItems, self.queue.limit)
+                condition, predicate = self.batchReady, lambda: self.queue.size >= batch
+            if not predicate():
+                self.batchWaiters += 1
+                waited = self._wait(condition, predicate, timeout)
+                self.batchWaiters -= 1
+                self.getWaits += 1
+                self.getWaitTime += timeout if waited is None else waited
+            items = self.queue.dequeue_many(maxItems)
+            self.gets += len(items)
+            if items:
+                self.notFull.notify_all()
+            return items
+
+
+class AsyncQueue(_MeteredQueue):
+    # asyncio bounded queue: put waits while the queue is full (backpressure on producers)
+    # and get waits while it is empty; both accept a timeout in seconds
+    def __init__(self, limit=10):
+        super().__init__(limit)
+        self.lock = asyncio.Lock()
+        self.notEmpty = asyncio.Condition(self.lock)
+        self.notFull = asyncio.Condition(self.lock)
+        self.batchReady = asyncio.Condition(self.lock) # get_batch callers waiting for a full batch
+
+    async def _wait(self, condition, predicate, timeout):
+        # waits on condition until predicate holds; returns the time spent waiting, or None on timeout
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(condition.wait_for(predicate), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return time.monotonic() - start
+
+    async def put(self, item, timeout=None):
+        # returns False if the queue stayed full until the timeout
+        async with self.notFull:
+            if self.queue.isFull():
+                waited = await self._wait(self.notFull, lambda: not self.queue.isFull(), timeout)
+                if waited is None:
+                    return False
+                self.putWaits += 1
+                self.putWaitTime += waited
+            self.queue.enqueue(item)
+            self._recordPuts(1)
+            return True
+
+    async def get(self, timeout=None):
+        # raises IndexError if no item arrived before the timeout
+        async with self.notEmpty:
+            if self.queue.isEmpty():
+                waited = await self._wait(self.notEmpty, lambda: not self.queue.isEmpty(), timeout)
+                if waited is None:
+                    raise IndexError("get from an empty queue")
+                self.getWaits += 1
+                self.getWaitTime += waited
+            item = self.queue.dequeue()
+            self.gets += 1
+            self.notFull.notify()
+            return item
+
+    async def get_batch(self, maxItems, timeout=None):
+        # returns up to maxItems items with one wakeup: without timeout, as soon as at least one item is
+        # available; with a timeout, once maxItems items are available or the deadline passes (possibly none)
+        async with self.lock:
+            if timeout is None:
+                condition, predicate = self.notEmpty, lambda: not self.queue.isEmpty()
+            else:
+                batch = min(maxItems, self.queue.limit)
+                condition, predicate = self.batchReady, lambda: self.queue.size >= batch
+            if not predicate():
+                self.batchWaiters += 1
+                waited = await self._wait(condition, predicate, timeout)
+                self.batchWaiters -= 1
+                self.getWaits += 1
+                self.getWaitTime += timeout if waited is None else waited
+            items = self.queue.dequeue_many(maxItems)
+            self.gets += len(items)
+            if items:
+                self.notFull.notify_all()
+            return items
+
 
 if __name__ == "__main__":
     q = Queue()
     for i in range(10):
         q.enqueue(i)
     print(q)
-    
+
     for i in range(5):
         q.dequeue()
     print(q)
+
+    print(q.enqueue_many(range(10, 20)))
+    print(q.dequeue_many(3))
+    print(q)
@@ -20,6 +20,8 @@ Time complexity (worst case):
     - Insertion (pushing): O(1)
     - Deletion (popping): O(1)
 """
+from collections import deque
+
 
 class Stack:
     def __init__(self, limit=10):
@@ -54,6 +56,140 @@ class Stack:
         return self.items == []
     
     
+class MinMaxStack(Stack):
+    # stack that also answers "what is the smallest / largest item?" in O(1):
+    # next to every item it stores the minimum and maximum of the stack up to and including that item
+    def __init__(self, limit=None):
+        super().__init__(limit)
+        self.mins = []
+        self.maxs = []
+
+    def push(self, item):
+        # raises OverflowError instead of pushing past the limit
+        if self.limit is not None and len(self.items) >= self.limit:
+            raise OverflowError("Stack Overflow")
+        self.items.append(item)
+        if self.mins:
+            self.mins.append(item if item < self.mins[-1] else self.mins[-1])
+            self.maxs.append(item if self.maxs[-1] < item else self.maxs[-1])
+        else:
+            self.mins.append(item)
+            self.maxs.append(item)
+
+    def pop(self):
+        # raises IndexError on an empty stack
+        self.mins.pop()
+        self.maxs.pop()
+        return self.items.pop()
+
+    def peek(self):
+        return self.items[-1]
+
+    def get_min(self):
+        return self.mins[-1]
+
+    def get_max(self):
+        return self.maxs[-1]
+
+
+class MonotonicStack:
+    # stack whose items are kept in monotonic order: pushing an item first pops every item that would break
+    # the order, so each item is pushed and popped at most once and a stream of n items costs O(n) in total.
+    # With increasing=True the items never decrease from bottom to top and an item pops those greater than it
+    # (each popped item has found its next smaller item); with increasing=False they never increase and
+    # an item pops those smaller than it (each popped item has found its next greater item).
+    def __init__(self, increasing=True):
+        self.items = []
+        self.increasing = increasing
+
+    def __len__(self):
+        return len(self.items)
+
+    def push(self, item, key=None):
+        # pushes item and returns the items it popped, top first; key is compared instead of the items
+        value = item if key is None else key(item)
+        popped = []
+        items = self.items
+        while items:
+            top = items[-1] if key is None else key(items[-1])
+            if not ((value < top) if self.increasing else (top < value)):
+                break
+            popped.append(items.pop())
+        items.append(item)
+        return popped
+
+    def peek(self):
+        return self.items[-1]
+
+
+class MonotonicQueue:
+    # deque of (index, value) pairs whose values are kept monotonic, used for sliding window extremes:
+    # the front always holds the minimum (or maximum) of the values pushed since the last expired index
+    def __init__(self, maximum=False):
+        self.items = deque()
+        self.maximum = maximum
+
+    def __len__(self):
+        return len(self.items)
+
+    def push(self, index, value):
+        # values that can never be the window extreme again (older and not better than value) are dropped
+        items = self.items
+        if self.maximum:
+            while items and items[-1][1] <= value:
+                items.pop()
+        else:
+            while items and value <= items[-1][1]:
+                items.pop()
+        items.append((index, value))
+
+    def expire(self, index):
+        # drops the values pushed at positions before index
+        items = self.items
+        while items and items[0][0] < index:
+            items.popleft()
+
+    def front(self):
+        return self.items[0][1]
+
+
+def sliding_window_min(iterable, size):
+    # yields the minimum of every window of size consecutive values, as soon as the window is complete
+    return _sliding_window(iterable, size, False)
+
+
+def sliding_window_max(iterable, size):
+    # yields the maximum of every window of size consecutive values, as soon as the window is complete
+    return _sliding_window(iterable, size, True)
+
+
+def _sliding_window(iterable, size, maximum):
+    if size < 1:
+        raise ValueError("window size must be at least 1")
+    window = MonotonicQueue(maximum)
+    for index, value in enumerate(iterable):
+        window.push(index, value)
+        window.expire(index - size + 1)
+        if index >= size - 1:
+            yield window.front()
+
+
+def next_greater_elements(iterable):
+    # yields (index, value, nextGreater) for every value of the stream: nextGreater is the first later value
+    # that is strictly greater, or None. Triples are yielded as soon as they are known, so the output is not in
+    # index order; values with no greater value after them come out when the stream ends.
+    stack = MonotonicStack(increasing=False)
+    for index, value in enumerate(iterable):
+        for waiting, waitingValue in stack.push((index, value), key=_pair_value):
+            yield waiting, waitingValue, value
+    for index, value in stack.items:
+        yield index, value, None
+
+
+def _pair_value(pair):
+    return pair[1]
+
+
 if __name__ == "__main__":
     # test stack
     myStack = Stack()
@@ -65,3 +201,10 @@ if __name__ == "__main__":
     print(myStack.pop())
     print(myStack.peek())
     print(myStack.isEmpty())
+
+    minMax = MinMaxStack()
+    for i in [3, 1, 4, 1, 5]:
+        minMax.push(i)
+    print(minMax.get_min(), minMax.get_max())
+    print(list(sliding_window_max([1, 3, -1, -3, 5, 3, 6, 7], 3)))
+    print(sorted(next_greater_elements([2, 1, 2, 4, 3])))
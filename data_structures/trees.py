@@ -60,8 +60,28 @@
     Insertion: O(log(n))
     Deletion: O(log(n))
     
+* ################################################
+* ################### AVL Tree ###################
+* ################################################
+
+* Quick summary: 
+    - a self-balancing binary search tree: the heights of the two subtrees of every node differ by at most one.
+* Important facts:
+    - Every node stores the height of its subtree.
+    - After an insertion or deletion, the nodes on the path back to the root are checked, and any node whose subtrees
+      differ in height by two is fixed with one or two rotations.
+    - The height of the tree is at most about 1.44 * log2(n), so it can never become degenerate.
+    - Nodes can also store the size of their subtree, which finds the k-th smallest key or the rank of a key
+      in O(log(n)) (an order statistic tree), or any other summary of their subtree, such as the sum of its values.
+* Time complexity (worst case):
+    Access: O(log(n))
+    Search: O(log(n))
+    Insertion: O(log(n))
+    Deletion: O(log(n))
+    
 """
-from queue import Queue
+from array import array
+from collections import deque
 
 class Node:
     def __init__(self, data):
@@ -70,8 +90,46 @@ class Node:
         self.right = None
         
 class BinaryTree:
-    def __init__(self, data):
-        self.root = Node(data)
+    def __init__(self, data=None):
+        # BinaryTree() creates an empty tree
+        self.root = Node(data) if data is not None else None
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        """
+        Builds a perfectly balanced binary search tree from values in increasing order in O(n): the middle value
+        becomes the root and each half is built the same way. Repeated values are kept once, as insert does.
+        """
+        values = []
+        for data in iterable:
+            if values and data <= values[-1]:
+                if data == values[-1]:
+                    continue
+                raise ValueError("from_sorted needs values in increasing order")
+            values.append(data)
+        tree = cls()
+        stack = [(0, len(values), None, False)] # value range [low, high) and where to attach its middle node
+        while stack:
+            low, high, parent, isLeft = stack.pop()
+            if low >= high:
+                continue
+            middle = (low + high) // 2
+            node = Node(values[middle])
+            if parent is None:
+                tree.root = node
+            elif isLeft:
+                parent.left = node
+            else:
+                parent.right = node
+            stack.append((middle + 1, high, node, False))
+            stack.append((low, middle, node, True))
+        return tree
+
+    def freeze(self):
+        """
+        Exports the values of a binary search tree to a read-only EytzingerTree.
+        """
+        return EytzingerTree(self.iter_inorder())
         
     def printTree(self, traversal_type):
         if traversal_type == "preorder":
@@ -85,36 +143,93 @@ class BinaryTree:
         else:
             print("Traversal type " + str(traversal_type) + " is not supported.")
             return False
-        
+
+    def iter_preorder(self, start=None):
+        """
+        Yields the values in pre-order: the current node first, then the left subtree, and finally the right subtree.
+        Starts at the root by default; uses an explicit stack, so deep trees do not hit the recursion limit.
+        """
+        stack = [start if start is not None else self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            yield node.data
+            stack.append(node.right) # pushed first so that the left subtree is visited first
+            stack.append(node.left)
+
+    def iter_inorder(self, start=None):
+        """
+        Yields the values in in-order: the left subtree first, then the current node, and finally the right subtree.
+        """
+        stack = []
+        node = start if start is not None else self.root
+        while stack or node is not None:
+            while node is not None: # go down the leftmost path
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.data
+            node = node.right
+
+    def iter_postorder(self, start=None):
+        """
+        Yields the values in post-order: the left subtree first, then the right subtree, and finally the current node.
+        """
+        stack = []
+        node = start if start is not None else self.root
+        last = None # the node yielded last, to tell whether the right subtree is done
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            if top.right is not None and top.right is not last:
+                node = top.right
+            else:
+                stack.pop()
+                yield top.data
+                last = top
+
+    def iter_levelorder(self, start=None):
+        """
+        Yields the values level by level, from left to right.
+        """
+        start = start if start is not None else self.root
+        if start is None:
+            return
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            yield node.data
+            if node.left:
+                queue.append(node.left)
+            if node.right:
+                queue.append(node.right)
+
     def preOrderTraversal(self, start, traversal):
         """
         Pre-order traversal visits the current node first, then the left subtree, and finally the right subtree.
         """
-        if start:
-            traversal += (str(start.data) + "-")
-            traversal = self.preOrderTraversal(start.left, traversal)
-            traversal = self.preOrderTraversal(start.right, traversal)
-        return traversal
+        if start is None:
+            return traversal
+        return traversal + "".join([str(data) + "-" for data in self.iter_preorder(start)])
     
     def inOrderTraversal(self, start, traversal):
         """
         In-order traversal visits the left subtree first, then the current node, and finally the right subtree.
         """
-        if start:
-            traversal = self.inOrderTraversal(start.left, traversal)
-            traversal += (str(start.data) + "-")
-            traversal = self.inOrderTraversal(start.right, traversal)
-        return traversal
+        if start is None:
+            return traversal
+        return traversal + "".join([str(data) + "-" for data in self.iter_inorder(start)])
     
     def postOrderTraversal(self, start, traversal):
         """
         Post-order traversal visits the left subtree first, then the right subtree, and finally the current node.
         """
-        if start:
-            traversal = self.postOrderTraversal(start.left, traversal)
-            traversal = self.postOrderTraversal(start.right, traversal)
-            traversal += (str(start.data) + "-")
-        return traversal
+        if start is None:
+            return traversal
+        return traversal + "".join([str(data) + "-" for data in self.iter_postorder(start)])
     
     def levelOrderTraversal(self, start):
         """
@@ -122,22 +237,15 @@ class BinaryTree:
         """
         if start is None:
             return
-        queue = Queue()
-        queue.put(start)
-        traversal = ""
-        while not queue.empty():
-            node = queue.get()
-            traversal += str(node.data) + "-"
-            if node.left:
-                queue.put(node.left)
-            if node.right:
-                queue.put(node.right)
-        return traversal
+        return "".join([str(data) + "-" for data in self.iter_levelorder(start)])
     
     def insert(self, data, current_node):
         """
         Insertion adds a new node to the tree.
         """
+        if current_node is None and self.root is None: # first value of an empty tree
+            self.root = Node(data)
+            return
         if data < current_node.data:
             if current_node.left is None:
                 current_node.left = Node(data)
@@ -200,9 +308,411 @@ class BinaryTree:
             return self._searchHelper(data, current_node.left)
         elif data > current_node.data and current_node.right:
             return self._searchHelper(data, current_node.right)
-        
-    
-        
+
+
+class EytzingerTree:
+    """
+    Static binary search tree stored in one flat array in Eytzinger (BFS) order: the root is at index 1 and the
+    children of index k are at 2k and 2k + 1, so there are no node objects and no pointers to follow, and the first
+    levels of every search share the same few cache lines. Pass a typecode ("q", "d", ...) to store numbers in a
+    typed array.array instead of a list.
+    """
+    def __init__(self, sortedValues, typecode=None):
+        values = list(sortedValues)
+        self.size = len(values)
+        items = [values[0] if values else 0] * (self.size + 1) # index 0 is unused
+        i = 0
+        for k in self._inorderIndices():
+            items[k] = values[i]
+            i += 1
+        self.items = array(typecode, items) if typecode else items
+
+    def _inorderIndices(self):
+        """
+        Yields the array indices in in-order, which is sorted order.
+        """
+        stack = []
+        k = 1
+        while stack or k <= self.size:
+            while k <= self.size:
+                stack.append(k)
+                k = 2 * k
+            k = stack.pop()
+            yield k
+            k = 2 * k + 1
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        items = self.items
+        for k in self._inorderIndices():
+            yield items[k]
+
+    def __contains__(self, data):
+        return self.search(data)
+
+    def _lowerBoundIndex(self, data):
+        """
+        Returns the index of the smallest value >= data, or 0 if there is none. The loop has no data-dependent branch:
+        the comparison result picks the child. At the end k has gone one level past a leaf; the lower bound is
+        the node where the path last went left, found by removing the trailing 1 bits of k and the 0 bit before them.
+        """
+        items, size = self.items, self.size
+        k = 1
+        while k <= size:
+            k = 2 * k + (items[k] < data)
+        return k >> (~k & (k + 1)).bit_length()
+
+    def lower_bound(self, data):
+        """
+        Returns the smallest value >= data, or None.
+        """
+        k = self._lowerBoundIndex(data)
+        return self.items[k] if k else None
+
+    def search(self, data):
+        k = self._lowerBoundIndex(data)
+        return k != 0 and self.items[k] == data
+
+
+class AVLNode:
+    __slots__ = ("key", "value", "left", "right", "height", "size", "total")
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1 # number of nodes in the subtree
+        self.total = None # aggregate of the subtree, when the tree has one
+
+
+_EMPTY = object() # aggregate of no nodes in AVLTree.range_aggregate
+
+
+class AVLTree:
+    """
+    Ordered map kept balanced with AVL rotations. Every operation is iterative: the nodes visited on the way
+    down are kept on a path stack and fixed on the way back up, so no recursion limit applies.
+
+    Every node knows the size of its subtree, for select() and rank(). A tree can also maintain an aggregate
+    of its subtrees for range_aggregate(): combine is an associative function of two aggregates,
+    measure(key, value) the aggregate of one node (the value by default), and identity the result of a range
+    without keys (None by default). For example AVLTree(combine=operator.add, identity=0) sums the values,
+    and AVLTree(combine=max, measure=lambda key, value: key) finds the largest key.
+    """
+    def __init__(self, items=None, combine=None, identity=None, measure=None):
+        self.root = None
+        self.size = 0
+        self.combine = combine
+        self.identity = identity
+        self.measure = measure if measure is not None else lambda key, value: value
+        if items is not None:
+            for key, value in items:
+                self.insert(key, value)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        return self._findNode(key) is not None
+
+    def __iter__(self):
+        for node in self._iterNodes():
+            yield node.key
+
+    def items(self):
+        for node in self._iterNodes():
+            yield node.key, node.value
+
+    def _iterNodes(self):
+        """
+        Yields the nodes in key order, using an explicit stack.
+        """
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    @staticmethod
+    def _height(node):
+        return node.height if node is not None else 0
+
+    @staticmethod
+    def _size(node):
+        return node.size if node is not None else 0
+
+    def _update(self, node):
+        """
+        Recomputes the fields a node derives from its children.
+        """
+        left, right = node.left, node.right
+        node.height = 1 + max(self._height(left), self._height(right))
+        node.size = 1 + self._size(left) + self._size(right)
+        if self.combine is not None:
+            total = self.measure(node.key, node.value)
+            if left is not None:
+                total = self.combine(left.total, total)
+            if right is not None:
+                total = self.combine(total, right.total)
+            node.total = total
+
+    def _rotateLeft(self, node):
+        child = node.right
+        node.right = child.left
+        child.left = node
+        self._update(node)
+        self._update(child)
+        return child
+
+    def _rotateRight(self, node):
+        child = node.left
+        node.left = child.right
+        child.right = node
+        self._update(node)
+        self._update(child)
+        return child
+
+    def _rebalance(self, node):
+        """
+        Updates a node whose subtrees are balanced and returns the root of its subtree after the rotations.
+        """
+        left, right = node.left, node.right
+        leftHeight = left.height if left is not None else 0
+        rightHeight = right.height if right is not None else 0
+        if leftHeight - rightHeight > 1:
+            if self._height(left.left) < self._height(left.right):
+                node.left = self._rotateLeft(left)
+            return self._rotateRight(node)
+        if rightHeight - leftHeight > 1:
+            if self._height(right.right) < self._height(right.left):
+                node.right = self._rotateRight(right)
+            return self._rotateLeft(node)
+        self._update(node)
+        return node
+
+    def _fixPath(self, path):
+        """
+        Rebalances the nodes of a root-to-node path from the bottom up, relinking rotated subtrees.
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree = self._rebalance(node)
+            if subtree is not node:
+                if i == 0:
+                    self.root = subtree
+                elif path[i - 1].left is node:
+                    path[i - 1].left = subtree
+                else:
+                    path[i - 1].right = subtree
+
+    def _findNode(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def insert(self, key, value=None):
+        """
+        Adds key with the given value, or replaces the value if key is already present.
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                node.value = value
+                if self.combine is not None: # the aggregates on the path include the old value
+                    path.append(node)
+                    self._fixPath(path)
+                return
+        newNode = AVLNode(key, value)
+        self._update(newNode)
+        if not path:
+            self.root = newNode
+        elif key < path[-1].key:
+            path[-1].left = newNode
+        else:
+            path[-1].right = newNode
+        self.size += 1
+        self._fixPath(path)
+
+    def delete(self, key):
+        """
+        Removes key from the tree. Returns False if it was not present.
+        """
+        path = []
+        node = self.root
+        while node is not None and key != node.key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return False
+        if node.left is not None and node.right is not None:
+            # move the in-order successor into the node, then remove the successor instead
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            node = successor
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self.size -= 1
+        self._fixPath(path)
+        return True
+
+    def search(self, key):
+        """
+        Returns True if key is in the tree.
+        """
+        return self._findNode(key) is not None
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored for key, or default.
+        """
+        node = self._findNode(key)
+        return default if node is None else node.value
+
+    def getMinValue(self):
+        """
+        Returns the smallest key, or None if the tree is empty.
+        """
+        node = self.root
+        if node is None:
+            return None
+        while node.left is not None:
+            node = node.left
+        return node.key
+
+    def getMaxValue(self):
+        """
+        Returns the largest key, or None if the tree is empty.
+        """
+        node = self.root
+        if node is None:
+            return None
+        while node.right is not None:
+            node = node.right
+        return node.key
+
+    def getHeight(self):
+        return self._height(self.root)
+
+    def select(self, index):
+        """
+        Returns the key at the given 0-based index in sorted order, using the subtree sizes.
+        """
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("tree index out of range")
+        node = self.root
+        while True:
+            leftSize = self._size(node.left)
+            if index < leftSize:
+                node = node.left
+            elif index == leftSize:
+                return node.key
+            else:
+                index -= leftSize + 1
+                node = node.right
+
+    def _countBelow(self, key, inclusive):
+        """
+        Returns the number of keys smaller than key (smaller or equal when inclusive).
+        """
+        count = 0
+        node = self.root
+        while node is not None:
+            if key < node.key or (key == node.key and not inclusive):
+                node = node.left
+            else:
+                count += self._size(node.left) + 1
+                node = node.right
+        return count
+
+    def rank(self, key):
+        """
+        Returns the number of keys smaller than key, which is the index of key if it is present.
+        """
+        return self._countBelow(key, False)
+
+    def range_count(self, low, high):
+        """
+        Returns the number of keys with low <= key <= high.
+        """
+        if high < low:
+            return 0
+        return self._countBelow(high, True) - self._countBelow(low, False)
+
+    def range_aggregate(self, low, high):
+        """
+        Combines the measures of the nodes with low <= key <= high, in key order. Only the two paths to the
+        ends of the range are walked; the subtrees between them contribute their stored aggregates.
+        """
+        if self.combine is None:
+            raise ValueError("range_aggregate needs a tree created with a combine function")
+        combine = self.combine
+        node = self.root
+        while node is not None and not low <= node.key <= high: # the node where the two paths split
+            node = node.left if high < node.key else node.right
+        if node is None:
+            return self.identity
+        # the aggregates start out empty rather than at identity, so combine never sees identity
+        before = _EMPTY # aggregate of the range keys in the left subtree of the split node
+        current = node.left
+        while current is not None:
+            if current.key < low:
+                current = current.right
+            else:
+                total = self.measure(current.key, current.value)
+                if current.right is not None:
+                    total = combine(total, current.right.total)
+                before = total if before is _EMPTY else combine(total, before)
+                current = current.left
+        after = _EMPTY # aggregate of the range keys in the right subtree of the split node
+        current = node.right
+        while current is not None:
+            if current.key > high:
+                current = current.left
+            else:
+                total = self.measure(current.key, current.value)
+                if current.left is not None:
+                    total = combine(current.left.total, total)
+                after = total if after is _EMPTY else combine(after, total)
+                current = current.right
+        result = self.measure(node.key, node.value)
+        if before is not _EMPTY:
+            result = combine(before, result)
+        if after is not _EMPTY:
+            result = combine(result, after)
+        return result
+
 if __name__ == "__main__":
     # test binary tree
     tree = BinaryTree(1)
@@ -225,4 +735,25 @@ if __name__ == "__main__":
     print(tree.search(4))
     print(tree.search(6))
     print(tree.search(7))
-        
\ No newline at end of file
+    
+    # test bulk building and the Eytzinger layout
+    balanced = BinaryTree.from_sorted(range(1, 8))
+    print(balanced.printTree("levelorder"))
+    frozen = balanced.freeze()
+    print(frozen.items[1:], frozen.lower_bound(4.5), frozen.search(6), frozen.search(8))
+        
+    
+    # test AVL tree
+    avl = AVLTree()
+    for key in range(1, 16):
+        avl.insert(key, str(key))
+    print(avl.getHeight(), list(avl))
+    avl.delete(8)
+    print(avl.get(9), 8 in avl, len(avl))
+    print(avl.getMinValue(), avl.getMaxValue())
+    print(avl.select(7), avl.rank(9), avl.range_count(3, 10))
+    
+    totals = AVLTree(((key, key * 10) for key in range(1, 16)), combine=lambda a, b: a + b, identity=0)
+    print(totals.range_aggregate(3, 10))
+    largest = AVLTree(((key, key % 7) for key in range(1, 16)), combine=max)
+    print(largest.range_aggregate(3, 5), largest.range_aggregate(20, 30))
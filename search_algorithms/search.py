@@ -1,3 +1,11 @@
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # binary_search_many falls back to a merge-style sweep
+    np = None
+
+
 def linear_search(list, target):
     """
     Returns the index position of the target if found, else returns None
@@ -20,14 +28,328 @@ def binary_search(list, target):
     is in-place: Yes
     is stable: Yes
     """
-    first = 0
-    last = len(list) - 1
+    return _binary_search(list, target, 0, len(list) - 1)[0]
+
+
+def _binary_search(list, target, first, last):
+    # binary search of list[first..last] (inclusive) that also returns how many elements it probed
+    probes = 0
     while first <= last:
         midpoint = (first + last)//2
+        probes += 1
         if list[midpoint] == target:
-            return midpoint
+            return midpoint, probes
         elif list[midpoint] < target:
             first = midpoint + 1
         else:
             last = midpoint - 1
-    return None
\ No newline at end of file
+    return None, probes
+
+
+def lower_bound(list, target, key=None, first=0, last=None):
+    """
+    Returns the index of the first element of list[first:last] that is not less than target,
+    or last if there is none. This is where target would be inserted to keep the list sorted, before any equal elements.
+    With key, the list must be sorted by key(element) and target is compared against key(element).
+    time complexity: O(logn)
+    space complexity: O(1)
+    is in-place: Yes
+    is stable: Yes
+    """
+    if last is None:
+        last = len(list)
+    while first < last:
+        midpoint = (first + last)//2
+        value = list[midpoint] if key is None else key(list[midpoint])
+        if value < target:
+            first = midpoint + 1
+        else:
+            last = midpoint
+    return first
+
+
+def upper_bound(list, target, key=None, first=0, last=None):
+    """
+    Returns the index of the first element of list[first:last] that is greater than target,
+    or last if there is none. This is where target would be inserted to keep the list sorted, after any equal elements.
+    With key, the list must be sorted by key(element) and target is compared against key(element).
+    time complexity: O(logn)
+    space complexity: O(1)
+    is in-place: Yes
+    is stable: Yes
+    """
+    if last is None:
+        last = len(list)
+    while first < last:
+        midpoint = (first + last)//2
+        value = list[midpoint] if key is None else key(list[midpoint])
+        if target < value:
+            last = midpoint
+        else:
+            first = midpoint + 1
+    return first
+
+
+def count_in_range(list, low, high, key=None):
+    """
+    Returns the number of elements of a sorted list with low <= element <= high (or low <= key(element) <= high),
+    with two bisections and without looking at the elements in between.
+    time complexity: O(logn)
+    space complexity: O(1)
+    is in-place: Yes
+    is stable: Yes
+    """
+    first = lower_bound(list, low, key)
+    return max(0, upper_bound(list, high, key, first) - first)
+
+
+def iter_range(list, low, high, key=None):
+    """
+    Yields, in order, the elements of a sorted list with low <= element <= high (or low <= key(element) <= high).
+    The bounds are found by bisection and the elements are read from the list one at a time, so nothing is copied
+    and stopping early costs nothing.
+    time complexity: O(logn + k) for k elements yielded
+    space complexity: O(1)
+    is in-place: Yes
+    is stable: Yes
+    """
+    first = lower_bound(list, low, key)
+    last = upper_bound(list, high, key, first)
+    for i in range(first, last):
+        yield list[i]
+
+
+def _gallop(list, target, first, last):
+    # returns the first index in list[first:last] whose value is not less than target,
+    # probing with steps that double from first before bisecting, so nearby answers are found in few steps
+    bound = first
+    step = 1
+    while bound < last and list[bound] < target:
+        first = bound + 1
+        bound = first + step
+        step *= 2
+    return lower_bound(list, target, first=first, last=min(bound, last))
+
+
+def binary_search_many(list, targets, missing=-1):
+    """
+    Returns the index position of every target, in the order of targets, with missing for targets that are not found.
+    With duplicates, the index of the first occurrence is returned.
+    The targets are sorted and swept through the list in one pass: each search starts where the previous one ended
+    and gallops forward, so nearby targets cost a few comparisons instead of a full bisection.
+    When list is a NumPy array, the searches run vectorized with searchsorted and a NumPy array is returned.
+    time complexity: O(mlogm + mlog(n/m)) for m targets
+    space complexity: O(m)
+    is in-place: Yes
+    is stable: Yes
+    """
+    if np is not None and isinstance(list, np.ndarray):
+        targets = np.asarray(targets)
+        indexes = np.searchsorted(list, targets)
+        if len(list) == 0:
+            return np.full(len(targets), missing)
+        found = (indexes < len(list)) & (list[np.minimum(indexes, len(list) - 1)] == targets)
+        return np.where(found, indexes, missing)
+    if not hasattr(targets, "__getitem__"):
+        targets = [target for target in targets]
+    result = [missing] * len(targets)
+    first = 0
+    last = len(list)
+    for position in sorted(range(len(targets)), key=targets.__getitem__):
+        target = targets[position]
+        first = _gallop(list, target, first, last)
+        if first == last:
+            break
+        if list[first] == target:
+            result[position] = first
+    return result
+
+
+SMALL_LIST = 16
+UNIFORMITY_SAMPLES = 8
+UNIFORMITY_TOLERANCE = 0.1
+SearchResult = namedtuple("SearchResult", ["index", "strategy", "probes"])
+
+
+def _interpolation_search(list, target):
+    # interpolation search that also returns how many elements it probed; after log2(n) interpolation
+    # probes the remaining range is finished with binary search, so skewed data cannot make it linear
+    first = 0
+    last = len(list) - 1
+    probes = 0
+    budget = len(list).bit_length()
+    while first <= last and probes < budget:
+        low, high = list[first], list[last]
+        probes += 2
+        if target < low or high < target:
+            return None, probes
+        if low == high:
+            return (first if low == target else None), probes
+        # guess the position from where target sits between the two ends of the range
+        position = first + int((target - low) * (last - first) // (high - low))
+        probes += 1
+        if list[position] == target:
+            return position, probes
+        elif list[position] < target:
+            first = position + 1
+        else:
+            last = position - 1
+    index, binary_probes = _binary_search(list, target, first, last)
+    return index, probes + binary_probes
+
+
+def interpolation_search(list, target):
+    """
+    Returns the index position of the target if found, else returns None
+    Instead of the middle, probes the position where target would be if the values were evenly spread between
+    the two ends of the current range, which takes about loglogn probes on uniformly distributed numbers.
+    Only works on numbers. Falls back to binary search after logn probes, for skewed data.
+    time complexity: O(loglogn) on uniform data, O(logn) worst case
+    space complexity: O(1)
+    is in-place: Yes
+    is stable: Yes
+    """
+    return _interpolation_search(list, target)[0]
+
+
+def _exponential_search(list, target):
+    # exponential search that also returns how many elements it probed;
+    # reading past the end (IndexError) counts as finding a value greater than target
+    probes = 0
+    bound = 1
+    while True:
+        try:
+            value = list[bound - 1]
+        except IndexError:
+            break
+        probes += 1
+        if not value < target:
+            break
+        bound *= 2
+    # list[bound//2 - 1] < target, and list[bound - 1] is either past the end or not less than target
+    first = bound//2
+    last = bound - 1
+    while first <= last:
+        midpoint = (first + last)//2
+        try:
+            value = list[midpoint]
+        except IndexError:
+            last = midpoint - 1
+            continue
+        probes += 1
+        if value == target:
+            return midpoint, probes
+        elif value < target:
+            first = midpoint + 1
+        else:
+            last = midpoint - 1
+    return None, probes
+
+
+def exponential_search(list, target):
+    """
+    Returns the index position of the target if found, else returns None
+    Probes positions 0, 1, 3, 7, 15, ... until it passes target, then binary searches the last gap. It never asks for
+    the length of the list, so it works on unbounded or still-growing sorted sequences that raise IndexError past
+    their end, and it is fastest when target is near the start.
+    time complexity: O(logi) where i is the position of target
+    space complexity: O(1)
+    is in-place: Yes
+    is stable: Yes
+    """
+    return _exponential_search(list, target)[0]
+
+
+def galloping_search(list, target, start=0):
+    """
+    Returns the index position of the target if found, else returns None
+    Gallops from start towards target with steps that double (1, 2, 4, ...), forwards or backwards, then binary
+    searches the last step. Fast when a good guess of the position is known, such as the previous answer
+    when looking up increasing targets.
+    time complexity: O(logd) where d is the distance between start and the position of target
+    space complexity: O(1)
+    is in-place: Yes
+    is stable: Yes
+    """
+    n = len(list)
+    if n == 0:
+        return None
+    start = min(max(start, 0), n - 1)
+    if list[start] < target:
+        index = _gallop(list, target, start, n)
+    else:
+        # gallop backwards to the first element that is not less than target
+        last = start
+        step = 1
+        first = start - 1
+        while first >= 0 and not list[first] < target:
+            last = first
+            first -= step
+            step *= 2
+        index = lower_bound(list, target, first=max(first + 1, 0), last=last)
+    if index < n and list[index] == target:
+        return index
+    return None
+
+
+def _choose_strategy(list):
+    # returns the strategy for a sorted list and the number of elements read to pick it
+    try:
+        n = len(list)
+    except TypeError:
+        return "exponential", 0
+    if n <= SMALL_LIST:
+        return "linear", 0
+    low, high = list[0], list[n - 1]
+    numbers = (int, float)
+    if not isinstance(low, numbers) or not isinstance(high, numbers) or not low < high:
+        return "binary", 2
+    for k in range(1, UNIFORMITY_SAMPLES):
+        i = k * (n - 1) // UNIFORMITY_SAMPLES
+        value = list[i]
+        if not isinstance(value, numbers):
+            return "binary", k + 2
+        expected = low + (high - low) * i / (n - 1)
+        if abs(value - expected) > UNIFORMITY_TOLERANCE * (high - low):
+            return "binary", k + 2
+    return "interpolation", UNIFORMITY_SAMPLES + 1
+
+
+def choose_strategy(list):
+    """
+    Returns the name of the search strategy search() would use on a sorted list: "exponential" when its length is
+    unknown, "linear" for very short lists, "interpolation" when a sample of UNIFORMITY_SAMPLES evenly spaced numbers
+    is close to a straight line between the first and the last values, and "binary" otherwise.
+    The sample costs a few probes, so the result is worth reusing for repeated searches of the same list.
+    """
+    return _choose_strategy(list)[0]
+
+
+def search(list, target, strategy=None):
+    """
+    Searches a sorted list with the strategy that suits it (see choose_strategy, or pass a strategy name to skip the
+    sampling), and returns a SearchResult(index, strategy, probes): the index position of the target or None,
+    the strategy used and the number of elements probed, including the sample taken to pick the strategy.
+    time complexity: O(logn), O(loglogn) on uniformly distributed numbers
+    space complexity: O(1)
+    is in-place: Yes
+    is stable: Yes
+    """
+    probes = 0
+    if strategy is None:
+        strategy, probes = _choose_strategy(list)
+    if strategy == "linear":
+        index = linear_search(list, target)
+        probes += len(list) if index is None else index + 1
+    elif strategy == "binary":
+        index, search_probes = _binary_search(list, target, 0, len(list) - 1)
+        probes += search_probes
+    elif strategy == "interpolation":
+        index, search_probes = _interpolation_search(list, target)
+        probes += search_probes
+    elif strategy == "exponential":
+        index, search_probes = _exponential_search(list, target)
+        probes += search_probes
+    else:
+        raise ValueError("Unknown search strategy: " + str(strategy))
+    return SearchResult(index, strategy, probes)
@@ -1,4 +1,49 @@
-def selection_sort(arr):
+"""
+Every sort takes key= and reverse= arguments that work as in sorted(): each key is computed once per element and
+the (key, index) pairs are sorted instead of the elements, so equal keys keep their original order, in both directions,
+even with the sorts that are not stable on their own.
+"""
+import heapq
+import os
+import random
+import sys
+import tempfile
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # the radix and counting sorts fall back to pure Python buckets
+    np = None
+
+
+
+def _keyed_sort(sort, arr, key, reverse, lo=0, hi=None, keys=None):
+    # decorate-sort-undecorate: sorts (key, index) pairs with sort and writes the elements back in that order
+    # the index breaks ties so that the elements themselves are never compared; it is negated for reverse
+    # so that reversing the sorted pairs keeps equal keys in their original order
+    if hi is None:
+        hi = len(arr)
+    items = list(arr[lo:hi])
+    if keys is None:
+        keys = items if key is None else [key(item) for item in items]
+    sign = -1 if reverse else 1
+    width = len(keys[0]) if keys and type(keys[0]) is tuple else -1
+    if width >= 0 and all(type(k) is tuple and len(k) == width for k in keys):
+        # tuple keys of one length: append the index instead of nesting, so comparisons stay one level deep
+        decorated = [k + (sign * i,) for i, k in enumerate(keys)]
+    else:
+        decorated = [(k, sign * i) for i, k in enumerate(keys)]
+    sort(decorated)
+    if reverse:
+        decorated.reverse()
+    result = [items[sign * d[-1]] for d in decorated]
+    arr[lo:hi] = array(arr.typecode, result) if isinstance(arr, array) else result
+    return arr
+
+def selection_sort(arr, key=None, reverse=False):
     """
     The algorithm repeatedly selects the smallest (or largest) element from the unsorted 
     portion of the list and swaps it with the first element of the unsorted part. 
@@ -10,6 +55,8 @@ def selection_sort(arr):
     memory complexity: O(1)
     
     """
+    if key is not None or reverse:
+        return _keyed_sort(selection_sort, arr, key, reverse)
     # traverse through all array elements
     for i in range(len(arr)):
         # find the minimum element in remaining unsorted array
@@ -22,7 +69,7 @@ def selection_sort(arr):
     return arr
 
 
-def bubble_sort(arr):
+def bubble_sort(arr, key=None, reverse=False):
     """
     The algorithm repeatedly compares adjacent elements and swaps them if they are in the wrong order. 
     This process is repeated for the entire array until the array is sorted.
@@ -33,6 +80,8 @@ def bubble_sort(arr):
     memory complexity: O(1)
     
     """
+    if key is not None or reverse:
+        return _keyed_sort(bubble_sort, arr, key, reverse)
     # traverse through all array elements
     for i in range(len(arr)):
         # traverse the array from 0 to n-i-1
@@ -44,12 +93,13 @@ def bubble_sort(arr):
     return arr
 
 
-def insertion_sort(arr):
+def insertion_sort(arr, lo=0, hi=None, key=None, reverse=False):
     """
     The algorithm divides the array into two parts: sorted and unsorted. 
     Initially, the sorted part contains only the first element of the array. 
     Then, one by one, elements are picked from the unsorted part and inserted into their correct position in the sorted part. 
     This process is repeated until the entire array is sorted.
+    lo and hi restrict the sort to the slice arr[lo:hi], which lets the hybrid sorts use it on short runs.
     
     time complexity: O(n^2)
     is stable: Yes
@@ -57,19 +107,23 @@ def insertion_sort(arr):
     memory complexity: O(1)
     
     """
+    if key is not None or reverse:
+        return _keyed_sort(insertion_sort, arr, key, reverse, lo, hi)
+    if hi is None:
+        hi = len(arr)
     # traverse through all array elements
-    for i in range(1, len(arr)):
+    for i in range(lo + 1, hi):
         key = arr[i]
-        # move elements of arr[0..i-1], that are greater than key, to one position ahead of their current position
+        # move elements of arr[lo..i-1], that are greater than key, to one position ahead of their current position
         j = i-1
-        while(j >= 0 and key < arr[j]):
+        while(j >= lo and key < arr[j]):
             arr[j+1] = arr[j]
             j -= 1
         arr[j+1] = key
     return arr
 
 
-def merge_sort(arr):
+def merge_sort(arr, key=None, reverse=False):
     """
     The algorithm divides the array into two halves, sorts them recursively, and then merges the two sorted halves.
     
@@ -79,6 +133,8 @@ def merge_sort(arr):
     memory complexity: O(n)
     
     """
+    if key is not None or reverse:
+        return _keyed_sort(merge_sort, arr, key, reverse)
     # divide the array into two halves
     if(len(arr) > 1):
         mid = len(arr)//2
@@ -109,10 +165,84 @@ def merge_sort(arr):
     return arr
 
 
-def quick_sort(arr):
+INSERTION_SORT_CUTOFF = 16
+NINTHER_THRESHOLD = 128
+
+
+def _sift_down(arr, lo, root, n):
+    # moves arr[lo + root] down the max-heap stored in arr[lo:lo + n] until both children are smaller
+    item = arr[lo + root]
+    child = 2*root + 1
+    while child < n:
+        if child + 1 < n and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        if not item < arr[lo + child]:
+            break
+        arr[lo + root] = arr[lo + child]
+        root = child
+        child = 2*root + 1
+    arr[lo + root] = item
+
+
+def heap_sort(arr, lo=0, hi=None, key=None, reverse=False):
+    """
+    The algorithm builds a max-heap out of the array, then repeatedly swaps the largest element (the root)
+    with the last element of the heap, shrinks the heap by one and sifts the new root down.
+    lo and hi restrict the sort to the slice arr[lo:hi].
+    
+    time complexity: O(nlogn)
+    is stable: No
+    is in-place: Yes
+    memory complexity: O(1)
+    
+    """
+    if key is not None or reverse:
+        return _keyed_sort(heap_sort, arr, key, reverse, lo, hi)
+    if hi is None:
+        hi = len(arr)
+    n = hi - lo
+    # build the heap bottom-up
+    for root in range(n//2 - 1, -1, -1):
+        _sift_down(arr, lo, root, n)
+    # move the current maximum to the end of the heap
+    for end in range(n - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        _sift_down(arr, lo, 0, end)
+    return arr
+
+
+def _median_of_three(arr, a, b, c):
+    # returns the index of the median of arr[a], arr[b] and arr[c]
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+
+def _choose_pivot(arr, lo, hi):
+    # median of three for small partitions, Tukey's ninther (median of three medians) for large ones
+    n = hi - lo
+    mid = lo + n//2
+    if n > NINTHER_THRESHOLD:
+        step = n//8
+        a = _median_of_three(arr, lo, lo + step, lo + 2*step)
+        b = _median_of_three(arr, mid - step, mid, mid + step)
+        c = _median_of_three(arr, hi - 1 - 2*step, hi - 1 - step, hi - 1)
+        return _median_of_three(arr, a, b, c)
+    return _median_of_three(arr, lo, mid, hi - 1)
+
+
+def quick_sort(arr, key=None, reverse=False):
     """
     The algorithm picks a pivot element, rearranges the array elements in such a way that all elements smaller than the picked pivot element move to the left side of the pivot, and all greater elements move to the right side. 
-    The same steps are then performed recursively for the left and right sub-arrays.
+    The same steps are then performed for the left and right sub-arrays.
+    This version is an introsort: the pivot is a median of three (ninther for large partitions), elements equal to the
+    pivot are grouped in the middle (three-way partitioning) and never revisited, the smaller side is sorted first while
+    the larger one waits on an explicit stack, partitions that recurse deeper than 2*log2(n) are finished with heap sort,
+    and partitions of INSERTION_SORT_CUTOFF elements or fewer are finished with insertion sort.
     
     time complexity: O(nlogn)
     is stable: No
@@ -120,19 +250,728 @@ def quick_sort(arr):
     memory complexity: O(logn)
     
     """
-    # divide the array into two halves
-    if(len(arr) > 1):
-        pivot = arr[0]
-        left = []
-        right = []
-        for i in range(1, len(arr)):
-            if(arr[i] < pivot):
-                left.append(arr[i])
+    if key is not None or reverse:
+        return _keyed_sort(quick_sort, arr, key, reverse)
+    n = len(arr)
+    stack = [(0, n, 2 * n.bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > INSERTION_SORT_CUTOFF:
+            if depth == 0:
+                # too many unbalanced partitions: fall back to heap sort for a guaranteed O(nlogn)
+                heap_sort(arr, lo, hi)
+                break
+            depth -= 1
+            pivot = arr[_choose_pivot(arr, lo, hi)]
+            # three-way partition: arr[lo:lt] < pivot, arr[lt:gt] == pivot, arr[gt:hi] > pivot
+            lt, i, gt = lo, lo, hi
+            while i < gt:
+                item = arr[i]
+                if item < pivot:
+                    arr[i] = arr[lt]
+                    arr[lt] = item
+                    lt += 1
+                    i += 1
+                elif pivot < item:
+                    gt -= 1
+                    arr[i] = arr[gt]
+                    arr[gt] = item
+                else:
+                    i += 1
+            # keep the larger side for later and continue with the smaller one
+            if lt - lo < hi - gt:
+                stack.append((gt, hi, depth))
+                hi = lt
             else:
-                right.append(arr[i])
-        # sort the first and second halves
-        quick_sort(left)
-        quick_sort(right)
-        # merge the sorted halves
-        arr[:] = left + [pivot] + right
-    return arr
\ No newline at end of file
+                stack.append((lo, lt, depth))
+                lo = gt
+        else:
+            insertion_sort(arr, lo, hi)
+    return arr
+
+
+MIN_MERGE = 32
+MIN_GALLOP = 7
+
+
+def _min_run_length(n):
+    # take the six most significant bits of n, plus one if any of the remaining bits are set,
+    # so that n / min_run is a power of two or slightly less than one
+    r = 0
+    while n >= MIN_MERGE:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _count_run(arr, lo, hi):
+    # returns the length of the natural run starting at lo; strictly descending runs are reversed in place
+    run_hi = lo + 1
+    if run_hi == hi:
+        return 1
+    if arr[run_hi] < arr[lo]:
+        while run_hi + 1 < hi and arr[run_hi + 1] < arr[run_hi]:
+            run_hi += 1
+        run_hi += 1
+        arr[lo:run_hi] = arr[lo:run_hi][::-1]
+    else:
+        while run_hi + 1 < hi and not arr[run_hi + 1] < arr[run_hi]:
+            run_hi += 1
+        run_hi += 1
+    return run_hi - lo
+
+
+def _gallop_left(key, arr, lo, hi):
+    # returns the first index i in arr[lo:hi] with not arr[i] < key, probing lo+1, lo+3, lo+7, ... first
+    offset, last = 1, 0
+    while offset < hi - lo and arr[lo + offset - 1] < key:
+        last = offset
+        offset = (offset << 1) + 1
+    first, end = lo + last, min(lo + offset, hi)
+    while first < end:
+        mid = (first + end) // 2
+        if arr[mid] < key:
+            first = mid + 1
+        else:
+            end = mid
+    return first
+
+
+def _gallop_right(key, arr, lo, hi):
+    # returns the first index i in arr[lo:hi] with key < arr[i], probing lo+1, lo+3, lo+7, ... first
+    offset, last = 1, 0
+    while offset < hi - lo and not key < arr[lo + offset - 1]:
+        last = offset
+        offset = (offset << 1) + 1
+    first, end = lo + last, min(lo + offset, hi)
+    while first < end:
+        mid = (first + end) // 2
+        if key < arr[mid]:
+            end = mid
+        else:
+            first = mid + 1
+    return first
+
+
+def _merge_runs(arr, lo, mid, hi, buf, state):
+    # merges the adjacent sorted runs arr[lo:mid] and arr[mid:hi] using buf as scratch space
+    # elements of the left run that are <= the first right element are already in place,
+    # and so are elements of the right run that are >= the last left element
+    lo = _gallop_right(arr[mid], arr, lo, mid)
+    if lo == mid:
+        return
+    hi = _gallop_left(arr[mid - 1], arr, mid, hi)
+    # copy the left run into the scratch buffer and merge forward into arr
+    n = mid - lo
+    if len(buf) < n:
+        buf.extend([None] * (n - len(buf)))
+    buf[:n] = arr[lo:mid]
+    i, j, k = 0, mid, lo
+    min_gallop = state[0]
+    while i < n and j < hi:
+        # one element at a time until one run wins min_gallop times in a row
+        count_a = count_b = 0
+        while i < n and j < hi and count_a < min_gallop and count_b < min_gallop:
+            if arr[j] < buf[i]:
+                arr[k] = arr[j]
+                j += 1
+                count_b += 1
+                count_a = 0
+            else:
+                arr[k] = buf[i]
+                i += 1
+                count_a += 1
+                count_b = 0
+            k += 1
+        # galloping: copy whole stretches found by exponential search while they stay long
+        while i < n and j < hi:
+            end = _gallop_right(arr[j], buf, i, n)
+            count_a = end - i
+            arr[k:k + count_a] = buf[i:end]
+            k += count_a
+            i = end
+            if i == n:
+                break
+            end = _gallop_left(buf[i], arr, j, hi)
+            count_b = end - j
+            arr[k:k + count_b] = arr[j:end]
+            k += count_b
+            j = end
+            if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                min_gallop += 1
+                break
+            min_gallop = max(1, min_gallop - 1)
+    # whatever is left in the scratch buffer goes last; leftovers of the right run are already in place
+    arr[k:k + n - i] = buf[i:n]
+    state[0] = min_gallop
+
+
+def tim_sort(arr, key=None, reverse=False):
+    """
+    The algorithm is an adaptive merge sort. It splits the array into natural runs (already ascending
+    or strictly descending stretches, the latter reversed in place), extends short runs with insertion sort,
+    and merges runs from a stack that keeps their lengths balanced. Merges copy only the left run into
+    one reusable scratch buffer and switch to galloping (exponential search) when one run keeps winning,
+    so sorted and nearly-sorted inputs take close to linear time.
+    
+    time complexity: O(nlogn), O(n) for sorted or reversed input
+    is stable: Yes
+    is in-place: No
+    memory complexity: O(n)
+    
+    """
+    if key is not None or reverse:
+        return _keyed_sort(tim_sort, arr, key, reverse)
+    n = len(arr)
+    if n < 2:
+        return arr
+    min_run = _min_run_length(n)
+    runs = []  # stack of (start, length) of pending runs
+    buf = []
+    state = [MIN_GALLOP]
+
+    def merge_at(i):
+        start_a, len_a = runs[i]
+        start_b, len_b = runs[i + 1]
+        _merge_runs(arr, start_a, start_b, start_b + len_b, buf, state)
+        runs[i] = (start_a, len_a + len_b)
+        del runs[i + 1]
+
+    lo = 0
+    while lo < n:
+        run_len = _count_run(arr, lo, n)
+        if run_len < min_run:
+            # extend the run to min_run elements with insertion sort
+            run_len = min(min_run, n - lo)
+            insertion_sort(arr, lo, lo + run_len)
+        runs.append((lo, run_len))
+        lo += run_len
+        # keep the run stack invariants: len(A) > len(B) + len(C) and len(B) > len(C)
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                    (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+                if runs[i - 1][1] < runs[i + 1][1]:
+                    i -= 1
+            elif runs[i][1] > runs[i + 1][1]:
+                break
+            merge_at(i)
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+            i -= 1
+        merge_at(i)
+    return arr
+
+
+def _read_records(source, encoding):
+    # yields the records of a path or an iterable of strings, without their trailing newline
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding) as f:
+            for line in f:
+                yield line.rstrip("\n")
+    else:
+        for record in source:
+            yield record.rstrip("\n")
+
+
+def _write_records(records, f):
+    # writes records one per line and returns how many were written
+    count = 0
+    for record in records:
+        f.write(record)
+        f.write("\n")
+        count += 1
+    return count
+
+
+def _write_run(records, tmp_dir, encoding):
+    # spills a sorted run to a new temporary file and returns its path
+    fd, path = tempfile.mkstemp(suffix=".run", dir=tmp_dir)
+    with open(fd, "w", encoding=encoding) as f:
+        _write_records(records, f)
+    return path
+
+
+def _merge_runs_to(paths, f, encoding, key=None, reverse=False):
+    # k-way merges the sorted run files into f with a heap and returns the number of records written
+    files = [open(path, encoding=encoding) for path in paths]
+    try:
+        runs = [(line.rstrip("\n") for line in run) for run in files]
+        return _write_records(heapq.merge(*runs, key=key, reverse=reverse), f)
+    finally:
+        for run in files:
+            run.close()
+
+
+def external_sort(source, output, chunk_size=100000, max_memory=None, fan_in=64, tmp_dir=None, encoding="utf-8",
+                  key=None, reverse=False):
+    """
+    The algorithm sorts text records that do not fit in memory. It reads the records (lines) in chunks of at most
+    chunk_size records or max_memory estimated bytes, sorts each chunk in memory with tim_sort and spills it to a
+    temporary file as a sorted run. The runs are then k-way merged with a heap, fan_in runs at a time, in as many
+    passes as needed until a single merge writes the output.
+    
+    source is a file path or an iterable of strings, output a file path or a writable text file.
+    Records are compared as strings without their trailing newline and are written one per line.
+    Returns the number of records written.
+    
+    time complexity: O(nlogn)
+    is stable: Yes
+    is in-place: No
+    memory complexity: O(chunk_size + fan_in)
+    
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, "w", encoding=encoding) as f:
+            return external_sort(source, f, chunk_size, max_memory, fan_in, tmp_dir, encoding, key, reverse)
+    with tempfile.TemporaryDirectory(prefix="external_sort_", dir=tmp_dir) as work_dir:
+        runs = []
+        chunk = []
+        chunk_bytes = 0
+        for record in _read_records(source, encoding):
+            chunk.append(record)
+            if max_memory is not None:
+                chunk_bytes += sys.getsizeof(record)
+            if len(chunk) >= chunk_size or (max_memory is not None and chunk_bytes >= max_memory):
+                runs.append(_write_run(tim_sort(chunk, key=key, reverse=reverse), work_dir, encoding))
+                chunk = []
+                chunk_bytes = 0
+        if not runs:
+            # everything fit in one chunk: no need to touch the disk
+            return _write_records(tim_sort(chunk, key=key, reverse=reverse), output)
+        if chunk:
+            runs.append(_write_run(tim_sort(chunk, key=key, reverse=reverse), work_dir, encoding))
+        # merge passes until at most fan_in runs are left
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                fd, path = tempfile.mkstemp(suffix=".run", dir=work_dir)
+                with open(fd, "w", encoding=encoding) as f:
+                    _merge_runs_to(group, f, encoding, key, reverse)
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            runs = merged
+        return _merge_runs_to(runs, output, encoding, key, reverse)
+
+
+PARALLEL_THRESHOLD = 100000
+SAMPLES_PER_WORKER = 64
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _numeric_typecode(arr):
+    # returns the array typecode that holds every element of arr exactly, or None for non-numeric data
+    if all(type(item) is int for item in arr):
+        if INT64_MIN <= min(arr) and max(arr) <= INT64_MAX:
+            return "q"
+        return None
+    if all(type(item) is float for item in arr):
+        return "d"
+    return None
+
+
+def _numpy_values(arr):
+    # returns a 1-d numeric ndarray holding arr exactly (a view for arrays and buffers), or None for other data
+    if isinstance(arr, np.ndarray):
+        return arr if arr.ndim == 1 and arr.dtype.kind in "iuf" else None
+    if isinstance(arr, array):
+        return np.frombuffer(arr, dtype=arr.typecode) if arr.typecode in INT_TYPECODES + FLOAT_TYPECODES else None
+    kinds = set(map(type, arr))
+    if kinds == {int}:
+        try:
+            return np.array(arr, dtype=np.int64)
+        except OverflowError:
+            return None
+    if kinds == {float}:
+        return np.array(arr, dtype=np.float64)
+    return None
+
+
+def _sort_chunk(chunk):
+    # worker: sorts a pickled chunk and sends it back
+    return auto_sort(chunk)
+
+
+def _sort_shared_range(name, typecode, lo, hi):
+    # worker: sorts items lo..hi of a shared memory block of typecode values in place
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        view = block.buf.cast(typecode)
+        view[lo:hi] = array(typecode, auto_sort(view[lo:hi].tolist()))
+        view.release()
+    finally:
+        block.close()
+
+
+def _sort_shared_ndarray_range(name, dtype, length, lo, hi):
+    # worker: sorts items lo..hi of a shared memory block holding length values of dtype in place with NumPy
+    block = shared_memory.SharedMemory(name=name)
+    view = None
+    try:
+        view = np.ndarray((length,), dtype=dtype, buffer=block.buf)[lo:hi]
+        # floats need a stable sort to keep -0.0 and 0.0 in order; equal ints are indistinguishable
+        view.sort(kind="stable" if view.dtype.kind == "f" else None)
+    finally:
+        view = None  # the block cannot be closed while an array still points into it
+        block.close()
+
+
+def _partition_by_splitters(arr, workers):
+    # sample sort step: picks workers - 1 splitters from a sorted random sample and buckets arr by them
+    sample = tim_sort(random.sample(arr, min(len(arr), workers * SAMPLES_PER_WORKER)))
+    step = len(sample) / workers
+    splitters = [sample[int(i * step)] for i in range(1, workers)]
+    buckets = [[] for _ in range(workers)]
+    for item in arr:
+        buckets[bisect_right(splitters, item)].append(item)
+    return buckets
+
+
+def _partition_in_chunks(arr, workers):
+    size = -(-len(arr) // workers)
+    return [arr[i:i + size] for i in range(0, len(arr), size)]
+
+
+def _partition_ndarray_by_splitters(values, workers, out):
+    # sample sort step with NumPy: buckets values by the splitters and writes the buckets one after the other
+    # into out, keeping the input order within each bucket; returns the (lo, hi) bounds of every bucket
+    sample = np.sort(values[random.sample(range(len(values)), min(len(values), workers * SAMPLES_PER_WORKER))])
+    step = len(sample) / workers
+    splitters = sample[[int(i * step) for i in range(1, workers)]]
+    buckets = np.searchsorted(splitters, values, side="right")
+    if workers <= 1 << 16:
+        buckets = buckets.astype(np.uint16)  # small keys make the stable argsort a radix sort
+    np.take(values, np.argsort(buckets, kind="stable"), out=out)
+    ends = np.cumsum(np.bincount(buckets, minlength=workers)).tolist()
+    return list(zip([0] + ends[:-1], ends))
+
+
+def _parallel_sort_ndarray(arr, values, workers, method):
+    # sorts the numeric data of arr, given as the ndarray values, in a shared memory block and writes it back
+    n = len(values)
+    block = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    data = None
+    try:
+        data = np.ndarray((n,), dtype=values.dtype, buffer=block.buf)
+        if method == "sample":
+            bounds = _partition_ndarray_by_splitters(values, workers, data)
+        else:
+            data[:] = values
+            size = -(-n // workers)
+            bounds = [(lo, min(lo + size, n)) for lo in range(0, n, size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_sort_shared_ndarray_range, block.name, data.dtype.str, n, lo, hi)
+                       for lo, hi in bounds if hi - lo > 1]
+            for future in futures:
+                future.result()
+        if method == "chunks":
+            data.sort(kind="stable")  # merges the sorted chunks, which the stable sort finds as runs
+        if isinstance(arr, list):
+            arr[:] = data.tolist()
+        else:
+            values[:] = data  # values is arr itself or a view of its buffer
+    finally:
+        data = None  # the block cannot be closed while an array still points into it
+        block.close()
+        block.unlink()
+    return arr
+
+
+def parallel_sort(arr, workers=None, method="sample", threshold=PARALLEL_THRESHOLD, key=None, reverse=False):
+    """
+    The algorithm spreads the sort over a pool of worker processes. With method="sample" (sample sort) a random sample
+    picks splitters that bucket the array into one value range per worker, so the sorted buckets only need to be
+    concatenated. With method="chunks" the array is cut into equal chunks whose sorted results are k-way merged with a heap.
+    Arrays of ints (in the int64 range) or floats are copied once into shared memory and sorted there by the workers,
+    which avoids pickling the data back and forth; other data is pickled to the workers. When NumPy is installed the
+    numeric data is bucketed straight into shared memory with NumPy and each worker sorts its range there with NumPy;
+    otherwise each part is sorted with auto_sort. Inputs shorter than threshold are sorted in the current process with auto_sort.
+    
+    time complexity: O(nlogn / workers) for the worker sorts, plus O(nlog(workers)) to partition or merge
+    is stable: Yes
+    is in-place: No
+    memory complexity: O(n)
+    
+    """
+    if key is not None or reverse:
+        # the pairs are built here, so key functions never have to be pickled
+        return _keyed_sort(lambda pairs: parallel_sort(pairs, workers, method, threshold), arr, key, reverse)
+    if method not in ("sample", "chunks"):
+        raise ValueError("Unknown parallel sort method: " + str(method))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if len(arr) < max(threshold, 2) or workers < 2:
+        return auto_sort(arr)
+    values = _numpy_values(arr) if np is not None else None
+    if values is not None:
+        return _parallel_sort_ndarray(arr, values, workers, method)
+    if method == "sample":
+        parts = _partition_by_splitters(arr, workers)
+    else:
+        parts = _partition_in_chunks(arr, workers)
+    typecode = _numeric_typecode(arr)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if typecode is None:
+            parts = list(pool.map(_sort_chunk, parts))
+        else:
+            data = array(typecode)
+            bounds = []
+            for part in parts:
+                bounds.append((len(data), len(data) + len(part)))
+                data.extend(part)
+            block = shared_memory.SharedMemory(create=True, size=max(1, len(data) * data.itemsize))
+            try:
+                view = block.buf.cast(typecode)
+                view[:len(data)] = data
+                futures = [pool.submit(_sort_shared_range, block.name, typecode, lo, hi) for lo, hi in bounds]
+                for future in futures:
+                    future.result()
+                parts = [view[lo:hi].tolist() for lo, hi in bounds]
+                view.release()
+            finally:
+                block.close()
+                block.unlink()
+    if method == "sample":
+        arr[:] = [item for part in parts for item in part]
+    else:
+        arr[:] = heapq.merge(*parts)
+    return arr
+
+
+RADIX_THRESHOLD = 256
+COUNTING_RANGE_FACTOR = 4
+UINT64_MASK = (1 << 64) - 1
+SIGN_BIT = 1 << 63
+INT_TYPECODES = "bBhHiIlLqQ"
+FLOAT_TYPECODES = "fd"
+
+
+def _store(arr, values):
+    # writes the sorted values back into arr, whatever container it is, and returns arr
+    if isinstance(arr, array):
+        arr[:] = array(arr.typecode, values)
+    elif np is not None and isinstance(values, np.ndarray) and not isinstance(arr, np.ndarray):
+        arr[:] = values.tolist()
+    else:
+        arr[:] = values
+    return arr
+
+
+def _element_kind(arr):
+    # returns "int" or "float" for homogeneous numeric data, None otherwise
+    if isinstance(arr, array):
+        if arr.typecode in INT_TYPECODES:
+            return "int"
+        return "float" if arr.typecode in FLOAT_TYPECODES else None
+    if np is not None and isinstance(arr, np.ndarray):
+        return {"i": "int", "u": "int", "f": "float"}.get(arr.dtype.kind)
+    if all(type(item) is int for item in arr):
+        return "int"
+    if all(type(item) is float for item in arr):
+        return "float"
+    return None
+
+
+def _float_keys(values):
+    # maps floats to unsigned 64-bit keys with the same order: flip every bit of negatives, set the sign bit of positives
+    bits = array("Q")
+    bits.frombytes(array("d", values).tobytes())
+    return [key ^ UINT64_MASK if key & SIGN_BIT else key | SIGN_BIT for key in bits]
+
+
+def _float_values(keys):
+    # inverse of _float_keys
+    bits = array("Q", [key ^ SIGN_BIT if key & SIGN_BIT else key ^ UINT64_MASK for key in keys])
+    values = array("d")
+    values.frombytes(bits.tobytes())
+    return values
+
+
+def _radix_sort_unsigned(keys, bits):
+    # LSD radix sort of non-negative ints below 2**bits: one stable bucket pass per digit, least significant first
+    digit_bits = 16 if len(keys) >= 1 << 16 else 8
+    mask = (1 << digit_bits) - 1
+    for shift in range(0, bits, digit_bits):
+        buckets = [[] for _ in range(mask + 1)]
+        for key in keys:
+            buckets[(key >> shift) & mask].append(key)
+        keys = [key for bucket in buckets for key in bucket]
+    return keys
+
+
+def _numpy_radix_order(keys):
+    # returns the permutation that sorts a uint64 ndarray, one stable argsort over 16-bit digits per pass
+    bits = int(keys.max()).bit_length()
+    order = np.arange(len(keys))
+    for shift in range(0, bits, 16):
+        digits = ((keys[order] >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(np.uint16)
+        order = order[np.argsort(digits, kind="stable")]
+    return order
+
+
+def _numpy_keys(values, kind):
+    # maps an ndarray of ints (int64 range, or any unsigned dtype) or floats to order-preserving non-negative uint64 keys
+    if kind == "float":
+        bits = values.astype(np.float64).view(np.uint64)
+        return np.where(bits >> np.uint64(63), ~bits, bits | np.uint64(SIGN_BIT))
+    if values.dtype.kind == "u":
+        # unsigned values above 2**63 would wrap around in int64
+        values = values.astype(np.uint64)
+        return values - values.min()
+    values = values.astype(np.int64)
+    return (values - values.min()).astype(np.uint64)
+
+
+def _reorder(arr, order):
+    # writes the elements of arr back in the given order of original positions
+    items = list(arr)
+    return _store(arr, [items[i] for i in order])
+
+
+def _counting_order(keys, reverse):
+    # returns the permutation that stably sorts integer keys, by counting them and turning the counts into start positions
+    lo, hi = min(keys), max(keys)
+    counts = [0] * (hi - lo + 1)
+    for k in keys:
+        counts[k - lo] += 1
+    starts = [0] * len(counts)
+    total = 0
+    for value in (range(len(counts) - 1, -1, -1) if reverse else range(len(counts))):
+        starts[value] = total
+        total += counts[value]
+    order = [0] * len(keys)
+    for i, k in enumerate(keys):
+        order[starts[k - lo]] = i
+        starts[k - lo] += 1
+    return order
+
+
+def _radix_order(keys, reverse):
+    # returns the permutation that stably sorts int or float keys with radix passes
+    kind = _element_kind(keys)
+    if kind is None:
+        raise TypeError("radix_sort only sorts by homogeneous int or float keys")
+    if np is not None and (kind == "float" or (INT64_MIN <= min(keys) and max(keys) <= INT64_MAX)):
+        unsigned = _numpy_keys(np.asarray(keys), kind)
+        if reverse:
+            unsigned = unsigned.max() - unsigned
+        return _numpy_radix_order(unsigned).tolist()
+    if kind == "float":
+        unsigned = _float_keys(keys)
+    else:
+        lo = min(keys)
+        unsigned = [k - lo for k in keys]
+    if reverse:
+        top = max(unsigned)
+        unsigned = [top - k for k in unsigned]
+    # pack each key with its index into one int: sorting those is stable and the index comes back out of the low bits
+    shift = (len(keys) - 1).bit_length()
+    mask = (1 << shift) - 1
+    packed = [(k << shift) | i for i, k in enumerate(unsigned)]
+    packed = _radix_sort_unsigned(packed, max(unsigned).bit_length() + shift)
+    return [p & mask for p in packed]
+
+
+def counting_sort(arr, key=None, reverse=False):
+    """
+    The algorithm counts how many times each integer value occurs in the array, then rewrites the array by emitting
+    every value of the range from the minimum to the maximum as many times as it was counted.
+    Only works on integers, and is worth it when the range of values is not much larger than the array.
+    Uses NumPy's bincount when it is installed.
+    
+    time complexity: O(n + k) where k is the range of values
+    is stable: Yes
+    is in-place: No
+    memory complexity: O(n + k)
+    
+    """
+    if len(arr) < 2:
+        return arr
+    keys = arr if key is None else [key(item) for item in arr]
+    if _element_kind(keys) != "int":
+        # the int64 cast below would silently truncate floats
+        raise TypeError("counting_sort only sorts integers")
+    if key is not None or reverse:
+        return _reorder(arr, _counting_order(keys, reverse))
+    lo, hi = min(arr), max(arr)
+    if np is not None and INT64_MIN <= lo and hi <= INT64_MAX:
+        values = np.asarray(arr, dtype=np.int64)
+        lo = int(lo)
+        counts = np.bincount(values - lo)
+        return _store(arr, np.repeat(np.arange(lo, lo + len(counts), dtype=np.int64), counts))
+    counts = [0] * (hi - lo + 1)
+    for item in arr:
+        counts[item - lo] += 1
+    result = []
+    for offset, count in enumerate(counts):
+        if count:
+            result.extend([lo + offset] * count)
+    return _store(arr, result)
+
+
+def radix_sort(arr, key=None, reverse=False):
+    """
+    The algorithm maps every number to a non-negative integer key with the same order (integers are offset by the minimum,
+    floats have their IEEE 754 bits rearranged so that negative numbers come first), then sorts the keys digit by digit,
+    least significant digit first, with one stable bucket pass per digit.
+    Works on lists or array.array buffers of ints or floats, and on NumPy arrays, which are sorted with vectorized passes.
+    NaNs are ordered by their bit pattern, -0.0 comes before 0.0.
+    
+    time complexity: O(n * w / d) for w-bit keys and d-bit digits
+    is stable: Yes
+    is in-place: No
+    memory complexity: O(n + 2^d)
+    
+    """
+    if len(arr) < 2:
+        return arr
+    if key is not None or reverse:
+        keys = arr if key is None else [key(item) for item in arr]
+        return _reorder(arr, _radix_order(keys, reverse))
+    kind = _element_kind(arr)
+    if kind is None:
+        raise TypeError("radix_sort only sorts homogeneous int or float data")
+    if np is not None and (kind == "float" or (isinstance(arr, np.ndarray) and arr.dtype.kind in "iu") or
+                           (INT64_MIN <= min(arr) and max(arr) <= INT64_MAX)):
+        values = np.asarray(arr)
+        return _store(arr, values[_numpy_radix_order(_numpy_keys(values, kind))])
+    if kind == "float":
+        return _store(arr, _float_values(_radix_sort_unsigned(_float_keys(arr), 64)))
+    lo = min(arr)
+    keys = _radix_sort_unsigned([item - lo for item in arr], (max(arr) - lo).bit_length())
+    return _store(arr, [key + lo for key in keys])
+
+
+def auto_sort(arr, key=None, reverse=False):
+    """
+    Picks a sort for the data (or for the keys, when key is given): counting sort for integers whose range is small compared to the length of the array,
+    radix sort for other homogeneous int data and, when NumPy is installed, float data (lists, array.array buffers or
+    NumPy arrays), and tim_sort for everything else and for short inputs.
+    
+    time complexity: O(n) for numeric data, O(nlogn) otherwise
+    is stable: Yes
+    is in-place: No
+    memory complexity: O(n)
+    
+    """
+    n = len(arr)
+    keyed = key is not None or reverse
+    keys = [key(item) for item in arr] if key is not None else arr
+    kind = _element_kind(keys) if n >= RADIX_THRESHOLD else None
+    if kind == "float" and np is None:
+        # 64-bit float keys take too many pure Python bucket passes to beat a comparison sort
+        kind = None
+    if kind is None:
+        if keyed:
+            return _keyed_sort(tim_sort, arr, key, reverse, keys=list(keys))
+        return tim_sort(arr) if isinstance(arr, list) else _store(arr, tim_sort(list(arr)))
+    counting = kind == "int" and max(keys) - min(keys) <= COUNTING_RANGE_FACTOR * n
+    if not keyed:
+        return counting_sort(arr) if counting else radix_sort(arr)
+    order = _counting_order(keys, reverse) if counting else _radix_order(keys, reverse)
+    return _reorder(arr, order)